@@ -1,6 +1,12 @@
-from flask import Flask, request, jsonify
+import time
+# Taken before the other imports, so startup timings include them
+IMPORT_STARTED_AT = time.perf_counter()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from google.oauth2 import service_account
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from datetime import timedelta
 from dateutil import parser
 from dateutil.parser import parse as parse_dt
@@ -8,13 +14,29 @@ import datetime
 import pytz
 import logging
 import re
-import time
+import itertools
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from functools import wraps
+from contextlib import contextmanager
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import urllib.parse
 import msal
 import os
 import json
+import copy
+import queue
+import uuid
+import ipaddress
+import socket
+import sqlite3
+import contextvars
+import httplib2
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -37,36 +59,662 @@ MICROSOFT_CLIENT_ID = os.environ.get('MICROSOFT_CLIENT_ID')
 MICROSOFT_CLIENT_SECRET = os.environ.get('MICROSOFT_CLIENT_SECRET')
 MICROSOFT_TENANT_ID = os.environ.get('MICROSOFT_TENANT_ID')
 
-# Validate required environment variables
+# Required for the Teams check; enforced when the Graph client is first needed
 required_env_vars = ['MICROSOFT_CLIENT_ID', 'MICROSOFT_CLIENT_SECRET', 'MICROSOFT_TENANT_ID']
 missing_vars = [var for var in required_env_vars if not os.environ.get(var)]
-if missing_vars:
-    raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
 # MSAL Configuration
 AUTHORITY = f"https://login.microsoftonline.com/{MICROSOFT_TENANT_ID}"
 SCOPE = ["https://graph.microsoft.com/.default"]
 GRAPH_BETA = "https://graph.microsoft.com/beta"
+GRAPH_V1 = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_SIZE = 20  # Graph JSON $batch limit
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '5000'))
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', '3600'))  # seconds
+USER_NEGATIVE_CACHE_TTL = int(os.environ.get('USER_NEGATIVE_CACHE_TTL', '300'))  # seconds, for 404s
+CALL_RECORD_FETCH_CONCURRENCY = int(os.environ.get('CALL_RECORD_FETCH_CONCURRENCY', '6'))
+CALL_RECORD_CACHE_SIZE = int(os.environ.get('CALL_RECORD_CACHE_SIZE', '500'))
+CALL_RECORD_CACHE_TTL = int(os.environ.get('CALL_RECORD_CACHE_TTL', '900'))  # seconds
+MSAL_TOKEN_CACHE_FILE = os.environ.get('MSAL_TOKEN_CACHE_FILE')  # Optional: persist the MSAL token cache
+TOKEN_REFRESH_MARGIN = int(os.environ.get('TOKEN_REFRESH_MARGIN', '270'))  # seconds before expiry, below MSAL's 300
+
+# Calendar scan tuning
+CALENDAR_SCAN_CONCURRENCY = int(os.environ.get('CALENDAR_SCAN_CONCURRENCY', '10'))
+CALENDAR_SCAN_TIMEOUT = float(os.environ.get('CALENDAR_SCAN_TIMEOUT', '30'))  # seconds per scan
+CALENDAR_PRIORITY_PROBES = int(os.environ.get('CALENDAR_PRIORITY_PROBES', '2'))  # calendars probed first, 0 disables
+
+# Calendar client pool
+CALENDAR_CLIENT_POOL_SIZE = int(os.environ.get('CALENDAR_CLIENT_POOL_SIZE', '500'))
+CREDENTIAL_REFRESH_MARGIN = timedelta(seconds=int(os.environ.get('CREDENTIAL_REFRESH_MARGIN', '300')))
+
+# Local SQLite store and background Meet audit-log ingestion. The default path is
+# per instance and lost on restart (on Cloud Run /tmp is in memory); point it at a
+# mounted volume for the store to outlive the instance.
+LOCAL_STORE_PATH = os.environ.get('LOCAL_STORE_PATH', '/tmp/noshow-store.sqlite3')
+MEET_INGEST_INTERVAL = int(os.environ.get('MEET_INGEST_INTERVAL', '300'))  # seconds, 0 disables
+MEET_INGEST_BACKFILL_HOURS = int(os.environ.get('MEET_INGEST_BACKFILL_HOURS', '24'))
+MEET_AUDIT_LATENCY = int(os.environ.get('MEET_AUDIT_LATENCY', '1800'))  # seconds until audit logs are complete
+
+# Background Calendar sync into the local event index
+CALENDAR_SYNC_INTERVAL = int(os.environ.get('CALENDAR_SYNC_INTERVAL', '120'))  # seconds, 0 disables
+CALENDAR_SYNC_LOOKBACK_DAYS = int(os.environ.get('CALENDAR_SYNC_LOOKBACK_DAYS', '30'))
+CALENDAR_INDEX_MAX_STALENESS = int(os.environ.get('CALENDAR_INDEX_MAX_STALENESS', '600'))  # seconds
+CALENDAR_SYNC_MAX_BACKOFF = int(os.environ.get('CALENDAR_SYNC_MAX_BACKOFF', '3600'))  # seconds between failing syncs
+
+# Calendly link resolution cache
+CALENDLY_CACHE_TTL = int(os.environ.get('CALENDLY_CACHE_TTL', '604800'))  # seconds, resolved Teams IDs
+CALENDLY_NEGATIVE_CACHE_TTL = int(os.environ.get('CALENDLY_NEGATIVE_CACHE_TTL', '900'))  # seconds, failures
+
+# Internal identities: configured and directory users, aliases and internal domains
+INTERNAL_DOMAINS = [d.strip().lower() for d in os.environ.get('INTERNAL_DOMAINS', '').split(',') if d.strip()]
+INTERNAL_IDENTITIES_FILE = os.environ.get('INTERNAL_IDENTITIES_FILE')  # Optional JSON: emails, aliases, domains
+IDENTITY_SOURCES = [s.strip() for s in os.environ.get('IDENTITY_SOURCES', '').split(',') if s.strip()]  # google, graph
+IDENTITY_RELOAD_INTERVAL = int(os.environ.get('IDENTITY_RELOAD_INTERVAL', '3600'))  # seconds, 0 disables
+DIRECTORY_SCOPE = 'https://www.googleapis.com/auth/admin.directory.user.readonly'
+DIRECTORY_PAGE_SIZE = 500
+GRAPH_USERS_PAGE_SIZE = 999
+
+# Batch endpoint
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '4'))
+BATCH_MAX_WINDOW = timedelta(hours=int(os.environ.get('BATCH_MAX_WINDOW_HOURS', '6')))
+
+# Asynchronous job mode
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', '1000'))
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', '3600'))  # seconds finished jobs stay pollable
+JOB_CALLBACK_TIMEOUT = int(os.environ.get('JOB_CALLBACK_TIMEOUT', '10'))  # seconds
+# Optional: comma-separated hosts job callbacks may be sent to; any public https host when unset
+JOB_CALLBACK_ALLOWED_HOSTS = {host.strip().lower() for host in
+                              os.environ.get('JOB_CALLBACK_ALLOWED_HOSTS', '').split(',') if host.strip()}
+
+# Request time budgets
+UNIFIED_CHECK_TIMEOUT = float(os.environ.get('UNIFIED_CHECK_TIMEOUT', '120'))  # default budget per check, seconds
+MAX_REQUEST_TIME_BUDGET = float(os.environ.get('MAX_REQUEST_TIME_BUDGET', '300'))  # seconds
+UPSTREAM_TIMEOUT = float(os.environ.get('UPSTREAM_TIMEOUT', '30'))  # seconds per outbound call
+CALENDLY_TIMEOUT = 20  # seconds per Calendly redirect lookup
+
+# Pooled outbound HTTP
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '32'))  # keep-alive connections per host
+HTTP_MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', '3'))  # retries on connection errors, 429 and 503
+HTTP_RETRY_AFTER_MAX = float(os.environ.get('HTTP_RETRY_AFTER_MAX', '30'))  # longest Retry-After we wait, seconds
+
+# Unified result cache
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', '10000'))
+RESULT_CACHE_FINAL_TTL = int(os.environ.get('RESULT_CACHE_FINAL_TTL', '604800'))  # seconds, settled true/false
+RESULT_CACHE_SHORT_TTL = int(os.environ.get('RESULT_CACHE_SHORT_TTL', '300'))  # seconds, anything else
+RESULT_FINALITY_DELAY = int(os.environ.get('RESULT_FINALITY_DELAY', '14400'))  # seconds after meeting end
+
+# Upstream page sizes (API maximums)
+CALENDAR_PAGE_SIZE = 2500
+REPORTS_PAGE_SIZE = 1000
+
+# Startup
+READY_PREWARM = os.environ.get('READY_PREWARM', '0') == '1'  # /ready warms clients and tokens, 503 until done
+
+# Tracing
+TRACE_EXPORT_PATH = os.environ.get('TRACE_EXPORT_PATH')  # Optional: append every check's spans in Chrome trace format
+DEBUG_TIMING_HEADER = 'X-Debug-Timing'
+
+# Partial responses: only the fields the matchers and indexes read
+CALENDAR_EVENT_FIELDS = "id,status,summary,start(dateTime),end(dateTime),attendees(email),hangoutLink,location,description"
+CALENDAR_LIST_FIELDS = f"nextPageToken,nextSyncToken,items({CALENDAR_EVENT_FIELDS})"
+REPORTS_ACTIVITY_FIELDS = "nextPageToken,items(id(time),actor(email),events(parameters(name,value,boolValue)))"
+CALL_RECORD_LIST_SELECT = "id,startDateTime,endDateTime"
+CALL_RECORD_SELECT = "id,startDateTime,endDateTime,sessions"
+CALENDAR_SERVER_FILTER = os.environ.get('CALENDAR_SERVER_FILTER', '1') == '1'  # q=<invitee> on calendar scans
+
+# Calendar matching windows
+GOOGLE_MEET_TIME_BUFFER = timedelta(minutes=60)
+TEAMS_TIME_TOLERANCE = timedelta(minutes=15)
+
+# === Caching ===
+MISSING = object()
+
+class LRUCache:
+    """Thread-safe LRU cache with optional per-entry expiry"""
+    
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def get_or_create(self, key, factory):
+        """Return the cached value for key, creating it with factory() on a miss"""
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            with self._lock:
+                entry = self._data.get(key)
+                if entry is None:
+                    entry = (factory(), None)
+                    self._data[key] = entry
+                    while len(self._data) > self.maxsize:
+                        self._data.popitem(last=False)
+                value = entry[0]
+        return value
+    
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else None
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+    
+    def __len__(self):
+        return len(self._data)
+
+# === Request Deadlines ===
+class DeadlineExceeded(Exception):
+    pass
+
+class Deadline:
+    """Time budget of one check, shared by every upstream call made on its behalf"""
+    
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+        self.exceeded = False
+    
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def timeout(self, cap):
+        """Timeout for one upstream call: cap, shortened to whatever is left of the budget"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.exceeded = True
+            raise DeadlineExceeded("Request time budget exhausted")
+        return min(cap, remaining)
+    
+    @property
+    def partial(self):
+        """True once the budget cut something short, so the result may be incomplete"""
+        return self.exceeded or self.remaining() <= 0
+
+# Deadline of the check running in the current context, None outside of requests
+current_deadline = contextvars.ContextVar("current_deadline", default=None)
+
+def request_time_budget(value):
+    """Caller-supplied budget in seconds, clamped to MAX_REQUEST_TIME_BUDGET"""
+    try:
+        budget = float(value) if value is not None else UNIFIED_CHECK_TIMEOUT
+    except (TypeError, ValueError):
+        budget = UNIFIED_CHECK_TIMEOUT
+    return min(max(budget, 1.0), MAX_REQUEST_TIME_BUDGET)
+
+def upstream_timeout(cap=UPSTREAM_TIMEOUT):
+    """Timeout for an outbound call made now; raises DeadlineExceeded once the budget is spent"""
+    deadline = current_deadline.get()
+    return deadline.timeout(cap) if deadline else cap
+
+def mark_partial():
+    """Flag the current check's result as incomplete"""
+    deadline = current_deadline.get()
+    if deadline:
+        deadline.exceeded = True
+
+def submit_in_context(executor, fn, *args):
+    """Submit fn to a worker pool so it runs under the caller's deadline"""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+# === Metrics ===
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+request_latency = Histogram('noshow_request_duration_seconds', 'HTTP request latency',
+                            ['endpoint', 'outcome'], buckets=LATENCY_BUCKETS)
+check_latency = Histogram('noshow_check_duration_seconds', 'Unified check latency, including batch items and jobs',
+                          ['outcome'], buckets=LATENCY_BUCKETS)
+check_upstream_calls = Histogram('noshow_check_upstream_calls', 'Upstream HTTP calls made by one unified check',
+                                 buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500))
+upstream_requests = Counter('noshow_upstream_requests_total', 'Upstream HTTP requests', ['upstream', 'status'])
+upstream_latency = Histogram('noshow_upstream_request_duration_seconds', 'Upstream HTTP request latency',
+                             ['upstream'], buckets=LATENCY_BUCKETS)
+upstream_throttled = Counter('noshow_upstream_throttled_total', 'Upstream 429 responses, including retried ones',
+                             ['upstream'])
+startup_duration = Gauge('noshow_startup_seconds', 'Seconds from the start of the app import to each startup milestone',
+                         ['milestone'])
+
+class CallCounter:
+    """Upstream calls made on behalf of one check"""
+    
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def add(self):
+        with self._lock:
+            self.calls += 1
+
+current_call_counter = contextvars.ContextVar("current_call_counter", default=None)
+
+def upstream_name(url):
+    """Metrics label for an outbound URL"""
+    parts = urllib.parse.urlsplit(url)
+    host, path = parts.hostname or "", parts.path
+    if host == "graph.microsoft.com":
+        if "/callRecords" in path:
+            return "graph_call_records"
+        if path.endswith("/$batch"):
+            return "graph_users_batch"
+        if "/users" in path:
+            return "graph_users"
+        return "graph"
+    if host == "login.microsoftonline.com":
+        return "graph_token"
+    if host == "oauth2.googleapis.com":
+        return "google_token"
+    if "/calendar/" in path:
+        return "calendar"
+    if "/admin/reports/" in path:
+        return "reports"
+    if "/admin/directory/" in path:
+        return "directory"
+    if host.endswith("calendly.com"):
+        return "calendly"
+    return "other"
+
+def observe_upstream(upstream, status, started_at):
+    upstream_requests.labels(upstream, status).inc()
+    upstream_latency.labels(upstream).observe(time.monotonic() - started_at)
+    counter = current_call_counter.get()
+    if counter:
+        counter.add()
+
+class CacheCollector:
+    """Reads cache counters at scrape time, so lookups pay nothing extra"""
+    
+    def families(self):
+        return (
+            CounterMetricFamily('noshow_cache_hits', 'Cache hits', labels=['cache']),
+            CounterMetricFamily('noshow_cache_misses', 'Cache misses', labels=['cache']),
+            GaugeMetricFamily('noshow_cache_hit_ratio', 'Cache hits / lookups since start', labels=['cache'])
+        )
+    
+    def describe(self):
+        return list(self.families())
+    
+    def collect(self):
+        hits, misses, ratio = self.families()
+        for name, (cache_hits, cache_misses) in cache_counters().items():
+            hits.add_metric([name], cache_hits)
+            misses.add_metric([name], cache_misses)
+            lookups = cache_hits + cache_misses
+            ratio.add_metric([name], cache_hits / lookups if lookups else 0.0)
+        return [hits, misses, ratio]
+
+def cache_counters():
+    """(hits, misses) for every cache in the process"""
+    counters = {
+        name: (cache.hits, cache.misses) for name, cache in (
+            ("calendar_credentials", calendar_credentials_pool),
+            ("graph_users", user_details_cache),
+            ("call_records", call_record_cache),
+            ("results", result_cache),
+        )
+    }
+    counters["calendly_links"] = (calendly_stats["hits"], calendly_stats["misses"] + calendly_stats["coalesced"])
+    counters["graph_token"] = (token_stats["cache_hits"], token_stats["token_fetches"])
+    return counters
+
+REGISTRY.register(CacheCollector())
+
+@app.before_request
+def start_request_timer():
+    g.request_started_at = time.monotonic()
+
+@app.after_request
+def observe_request(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    outcome = g.get("outcome") or str(response.status_code)
+    request_latency.labels(endpoint, outcome).observe(time.monotonic() - g.request_started_at)
+    return response
+
+def no_show_outcome(response):
+    """Metrics label for a unified response: its no_show value, or 'partial'"""
+    if response.get("partial"):
+        return "partial"
+    return json.dumps(response.get("no_show")).strip('"')
+
+# === Tracing ===
+class Trace:
+    """Spans recorded for one check"""
+    
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.perf_counter()
+        self.wall_started_at = time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+    
+    def add(self, record):
+        with self._lock:
+            self.spans.append(record)
+    
+    def tree(self):
+        """Nested {name, start_ms, duration_ms, children} timing breakdown"""
+        nodes = {}
+        for record in sorted(self.spans, key=lambda record: record["start"]):
+            nodes[record["id"]] = {
+                "name": record["name"],
+                **record["args"],
+                "start_ms": round((record["start"] - self.started_at) * 1000, 1),
+                "duration_ms": round((record["end"] - record["start"]) * 1000, 1),
+                "children": []
+            }
+        roots = []
+        for record in sorted(self.spans, key=lambda record: record["start"]):
+            parent = nodes.get(record["parent"])
+            (parent["children"] if parent else roots).append(nodes[record["id"]])
+        return roots
+    
+    def chrome_events(self):
+        """Spans as Chrome trace-format complete events"""
+        pid = os.getpid()
+        return [{
+            "name": record["name"],
+            "ph": "X",
+            "ts": round((self.wall_started_at + record["start"] - self.started_at) * 1e6),
+            "dur": round((record["end"] - record["start"]) * 1e6),
+            "pid": pid,
+            "tid": record["tid"],
+            "args": {"trace_id": self.trace_id, **record["args"]}
+        } for record in self.spans]
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+current_span = contextvars.ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+_trace_export_lock = threading.Lock()
+
+@contextmanager
+def span(name, **args):
+    """Time a block as a span of the current trace; does nothing when the check isn't traced"""
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+    record = {"id": next(_span_ids), "parent": current_span.get(), "name": name, "args": args,
+              "tid": threading.get_ident(), "start": time.perf_counter()}
+    token = current_span.set(record["id"])
+    try:
+        yield
+    finally:
+        record["end"] = time.perf_counter()
+        current_span.reset(token)
+        trace.add(record)
+
+def traced(name):
+    """Decorator recording every call of a function as a span"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def export_trace(trace):
+    """Append a trace to TRACE_EXPORT_PATH as a Chrome trace-format JSON array (the closing ] is optional)"""
+    lines = "".join(json.dumps(event) + ",\n" for event in trace.chrome_events())
+    with _trace_export_lock:
+        with open(TRACE_EXPORT_PATH, "a") as f:
+            if f.tell() == 0:
+                f.write("[\n")
+            f.write(lines)
+
+# === HTTP Transport ===
+class DeadlineRetry(Retry):
+    """Retry that honours Retry-After, but never waits past HTTP_RETRY_AFTER_MAX or the request deadline"""
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None and response.status == 429 and _pool is not None:
+            upstream_throttled.labels(upstream_name(f"{_pool.scheme}://{_pool.host}{url or ''}")).inc()
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, upstream_timeout(HTTP_RETRY_AFTER_MAX))
+
+class InstrumentedAdapter(HTTPAdapter):
+    """Adapter that records every exchange it sends, redirect hops included, in the upstream metrics"""
+    
+    def __init__(self, upstream=None, **kwargs):
+        self.upstream = upstream
+        super().__init__(**kwargs)
+    
+    def send(self, prepared_request, **kwargs):
+        upstream = self.upstream or upstream_name(prepared_request.url)
+        started_at = time.monotonic()
+        parts = urllib.parse.urlsplit(prepared_request.url)
+        with span(upstream, method=prepared_request.method, url=f"{parts.netloc}{parts.path}"):
+            try:
+                response = super().send(prepared_request, **kwargs)
+            except Exception:
+                observe_upstream(upstream, "error", started_at)
+                raise
+        observe_upstream(upstream, str(response.status_code), started_at)
+        return response
+
+def build_http_session(max_redirects=None, upstream=None, retries=True):
+    """Thread-safe keep-alive session with a per-host connection pool and, unless retries is False, retries on 429/503"""
+    session = requests.Session()
+    retry = DeadlineRetry(
+        total=HTTP_MAX_RETRIES, read=0, backoff_factor=0.5, status_forcelist=(429, 503),
+        allowed_methods=None, respect_retry_after_header=True, raise_on_status=False
+    ) if retries else 0
+    adapter = InstrumentedAdapter(upstream, pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                                  max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    if max_redirects is not None:
+        session.max_redirects = max_redirects
+    return session
+
+# Shared by Graph, Google and token calls; Calendly redirects get their own redirect limit
+http_session = build_http_session()
+calendly_session = build_http_session(max_redirects=10, upstream="calendly")
+# Job callbacks are not idempotent, so a 429/503 must not re-POST them
+callback_session = build_http_session(upstream="job_callback", retries=False)
+
+def google_auth_request():
+    """Token refresh transport on the pooled session, with a timeout that respects the current deadline"""
+    request = GoogleAuthRequest(session=http_session)
+    return lambda *args, **kwargs: request(*args, timeout=upstream_timeout(), **kwargs)
+
+class GoogleApiHttp:
+    """httplib2-compatible adapter that sends googleapiclient requests through the pooled session.
+
+    httplib2.Http objects are not thread-safe and each keeps its own
+    connections; this lets every thread share http_session's pool instead.
+    """
+    
+    def __init__(self, credentials):
+        self.credentials = credentials
+    
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        for attempt in range(2):
+            request_headers = dict(headers or {})
+            self.credentials.before_request(google_auth_request(), method, uri, request_headers)
+            resp = http_session.request(method, uri, data=body, headers=request_headers, timeout=upstream_timeout())
+            # Retry once with a fresh token if it was revoked or expired early
+            if resp.status_code != 401 or attempt:
+                break
+            self.credentials.refresh(google_auth_request())
+        # requests already decompressed the body
+        response_headers = {k: v for k, v in resp.headers.items() if k.lower() != "content-encoding"}
+        response_headers["status"] = resp.status_code
+        return httplib2.Response(response_headers), resp.content
+
+# === Local Store ===
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_state (
+    key TEXT PRIMARY KEY,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS meet_participants (
+    meeting_code TEXT NOT NULL,
+    email TEXT NOT NULL,
+    activity_time REAL NOT NULL,
+    host TEXT,
+    PRIMARY KEY (meeting_code, activity_time, email)
+);
+CREATE TABLE IF NOT EXISTS calendar_sync (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    covered_from REAL,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS calendar_sync_failures (
+    calendar_id TEXT PRIMARY KEY,
+    failures INTEGER NOT NULL,
+    last_error TEXT,
+    retry_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calendar_events (
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    event_json TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS calendar_events_by_time ON calendar_events (start_ts, end_ts);
+CREATE TABLE IF NOT EXISTS calendar_attendees (
+    email TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    PRIMARY KEY (email, calendar_id, event_id)
+);
+CREATE TABLE IF NOT EXISTS calendar_hits (
+    invitee_domain TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    hits INTEGER NOT NULL,
+    last_hit_at REAL NOT NULL,
+    PRIMARY KEY (invitee_domain, calendar_id)
+);
+CREATE TABLE IF NOT EXISTS calendly_links (
+    url TEXT PRIMARY KEY,
+    meeting_id TEXT,
+    expires_at REAL NOT NULL
+);
+"""
+
+_store_local = threading.local()
+
+def get_store():
+    """Get this thread's connection to the local SQLite store"""
+    conn = getattr(_store_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(LOCAL_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(STORE_SCHEMA)
+        _store_local.conn = conn
+    return conn
+
+def get_store_state(key):
+    row = get_store().execute("SELECT value FROM store_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+def set_store_state(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO store_state (key, value) VALUES (?, ?)", (key, value))
+
+def format_utc_time(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, tz=pytz.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def start_background_worker(name, interval, target):
+    """Run target every interval seconds on a daemon thread"""
+    def loop():
+        while True:
+            try:
+                target()
+            except Exception as e:
+                logger.warning(f"[{name}] Background run failed: {e}")
+            time.sleep(interval)
+    
+    thread = threading.Thread(target=loop, name=name, daemon=True)
+    thread.start()
+    return thread
 
 # === Auth Setup for Google ===
+_service_account_lock = threading.Lock()
+_service_account_credentials = None
+
+def get_service_account_credentials():
+    """Load the service account credentials once per process from file or environment variable"""
+    global _service_account_credentials
+    with _service_account_lock:
+        if _service_account_credentials is None:
+            if SERVICE_ACCOUNT_JSON:
+                # Use JSON string from environment variable
+                service_account_info = json.loads(SERVICE_ACCOUNT_JSON)
+                _service_account_credentials = service_account.Credentials.from_service_account_info(
+                    service_account_info, scopes=SCOPES
+                )
+            else:
+                # Use JSON file
+                if not os.path.exists(SERVICE_ACCOUNT_FILE):
+                    raise FileNotFoundError(f"Service account file not found: {SERVICE_ACCOUNT_FILE}")
+                _service_account_credentials = service_account.Credentials.from_service_account_file(
+                    SERVICE_ACCOUNT_FILE, scopes=SCOPES
+                )
+        return _service_account_credentials
+
 def get_google_credentials():
     """Get Google service account credentials from file or environment variable"""
-    if SERVICE_ACCOUNT_JSON:
-        # Use JSON string from environment variable
-        service_account_info = json.loads(SERVICE_ACCOUNT_JSON)
-        return service_account.Credentials.from_service_account_info(
-            service_account_info, scopes=SCOPES
-        ).with_subject(DELEGATED_ADMIN_EMAIL)
-    else:
-        # Use JSON file
-        if not os.path.exists(SERVICE_ACCOUNT_FILE):
-            raise FileNotFoundError(f"Service account file not found: {SERVICE_ACCOUNT_FILE}")
-        return service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE, scopes=SCOPES
-        ).with_subject(DELEGATED_ADMIN_EMAIL)
+    return get_service_account_credentials().with_subject(DELEGATED_ADMIN_EMAIL)
+
+_reports_lock = threading.Lock()
+_reports_credentials = None
+_reports_service = None
+
+def get_reports_credentials():
+    """Get the delegated admin credentials the Reports API calls share, created on first use"""
+    global _reports_credentials
+    with _reports_lock:
+        if _reports_credentials is None:
+            _reports_credentials = get_google_credentials()
+        return _reports_credentials
 
-credentials = get_google_credentials()
-service = build('admin', 'reports_v1', credentials=credentials)
+def get_reports_service():
+    """Get the shared Reports resource, built once from the bundled discovery document"""
+    global _reports_service
+    with _reports_lock:
+        if _reports_service is None:
+            _reports_service = build('admin', 'reports_v1', http=httplib2.Http(),
+                                     static_discovery=True, cache_discovery=False)
+        return _reports_service
 
 INTERNAL_EMAILS = {
     "admin@giga.green", "j.bahr@giga.green", "a.hussien@giga.green", "j.starke@giga.green",
@@ -86,89 +734,428 @@ INTERNAL_EMAILS = {
     "f.neuhaus@giga.green", "c.thiemann@giga.green", "a.jawad@giga.green"
 }
 
+# ===================== LINK PARSING =====================
+
+# Patterns are compiled once and searched in priority order. A combined
+# alternation would scan the text once, but it defeats the literal-prefix
+# search re uses for each pattern on its own and benchmarks several times
+# slower (see bench/link_parser_bench.py).
+
+def first_match(patterns, text):
+    """Return (index, match) for the first pattern in priority order that matches text"""
+    for index, pattern in enumerate(patterns):
+        match = pattern.search(text)
+        if match:
+            return index, match
+    return None, None
+
+MEET_LINK_RE = re.compile(r'meet\.google\.com/([\w-]+)')
+
+TEAMS_INDICATORS = ('teams.microsoft.com', 'teams.live.com', 'teams meeting', 'calendly.com')
+CALENDLY_LINK_RE = re.compile(r'https://[^\s]*calendly[^\s]*')
+TEAMS_LINK_RE = re.compile(r'https://[^\s]*teams[^\s]*')
+
+# Teams meeting ID forms, most specific first; the first four yield thread IDs
+TEAMS_ID_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(19:meeting_[^/\s@\?]+@thread\.v2)',
+    r'(meeting_[^/\s@\?]+@thread\.v2)',
+    r'19%3Ameeting_([^%/\s@\?]+)%40thread\.v2',
+    r'meeting_([^%/\s@\?]+)%40thread\.v2',
+    r'teams\.microsoft\.com/.*meetup-join/(\d+)/(\w+)',
+    r'teams\.microsoft\.com/l/meetup-join/([^/\?]+)',
+    r'thread\.v2/([^/\?]+)',
+    r'meetingId=([^&\s]+)',
+    r'conference[Ii]d=([^&\s]+)',
+    r'teams\.live\.com/meet/([^/\?]+)',
+    r'orgid=([^&\s]+)',
+    r'meetings/([A-Za-z0-9+/=_-]+)',
+    r'join/([A-Za-z0-9+/=_-]+)',
+)]
+
+# Teams links embedded in a Calendly event page; index 2 captures the joinUrl value
+CALENDLY_PAGE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'https://teams\.microsoft\.com/l/meetup-join/[^\s"\']+',
+    r'https://teams\.live\.com/meet/[^\s"\']+',
+    r'"joinUrl":"([^"]*teams[^"]*)"',
+    r'teams\.microsoft\.com[^"\']*',
+    r'19:meeting_[^"\'@\s]+@thread\.v2',
+    r'meeting_[^"\'@\s]+@thread\.v2'
+)]
+
 # ===================== GOOGLE MEET FUNCTIONS =====================
 
+# Delegated credentials per calendar owner, refreshed ahead of expiry
+calendar_credentials_pool = LRUCache(CALENDAR_CLIENT_POOL_SIZE)
+_calendar_service_lock = threading.Lock()
+_calendar_service = None
+
 def get_calendar_credentials(user_email):
-    if SERVICE_ACCOUNT_JSON:
-        service_account_info = json.loads(SERVICE_ACCOUNT_JSON)
-        return service_account.Credentials.from_service_account_info(
-            service_account_info, scopes=SCOPES
-        ).with_subject(user_email)
-    else:
-        return service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE, scopes=SCOPES
-        ).with_subject(user_email)
+    """Get pooled delegated credentials for a user, refreshing the token before it expires"""
+    entry = calendar_credentials_pool.get_or_create(user_email.lower(), lambda: {
+        "credentials": get_service_account_credentials().with_subject(user_email),
+        "lock": threading.Lock()
+    })
+    creds = entry["credentials"]
+    with entry["lock"]:
+        expiry = creds.expiry
+        if not creds.token or expiry is None or expiry - datetime.datetime.utcnow() < CREDENTIAL_REFRESH_MARGIN:
+            creds.refresh(google_auth_request())
+    return creds
+
+def get_calendar_service():
+    """Get the shared Calendar resource, built once from the bundled discovery document.
+
+    The resource only builds requests; each call executes them with its own
+    authorized HTTP object, so it can be shared across threads.
+    """
+    global _calendar_service
+    with _calendar_service_lock:
+        if _calendar_service is None:
+            _calendar_service = build('calendar', 'v3', http=httplib2.Http(),
+                                      static_discovery=True, cache_discovery=False)
+        return _calendar_service
 
 def extract_meet_id(link):
-    import re
     if not link:
         return None
-    match = re.search(r'meet\.google\.com/([\w-]+)', link)
+    match = MEET_LINK_RE.search(link)
     if match:
         meet_id = match.group(1).replace('-', '')
         return meet_id
     return None
 
-def find_google_meet_id(start_time_dt, end_time_dt, invitee):
+def iter_calendar_pages(email, **params):
+    """Yield raw events().list pages for a user's calendar, following nextPageToken"""
+    http = GoogleApiHttp(get_calendar_credentials(email))
+    page_token = None
+    while True:
+        events_result = get_calendar_service().events().list(
+            calendarId=email,
+            singleEvents=True,
+            maxResults=CALENDAR_PAGE_SIZE,
+            pageToken=page_token,
+            fields=CALENDAR_LIST_FIELDS,
+            **params
+        ).execute(http=http)
+        yield events_result
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            return
+
+def iter_calendar_events(email, time_min, time_max, query=None):
+    """Yield single events on a user's calendar within a time window, one page at a time.
+
+    With query set, Calendar only returns events matching it as free text,
+    which includes attendee email addresses.
+    """
+    params = {"timeMin": time_min.isoformat(), "timeMax": time_max.isoformat()}
+    if query:
+        params["q"] = query
+    for events_result in iter_calendar_pages(email, **params):
+        yield from events_result.get('items', [])
+
+def record_calendar_hit(email, invitee_email):
+    """Count a calendar that held the meeting being looked for, overall ('*') and for the invitee's domain"""
+    domain = invitee_email.rpartition("@")[2]
+    try:
+        with get_store() as conn:
+            for invitee_domain in ("*", domain):
+                conn.execute(
+                    "INSERT INTO calendar_hits (invitee_domain, calendar_id, hits, last_hit_at) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (invitee_domain, calendar_id) DO UPDATE SET hits = hits + 1, "
+                    "last_hit_at = excluded.last_hit_at",
+                    (invitee_domain, email.lower(), time.time())
+                )
+    except sqlite3.Error as e:
+        logger.warning(f"[CALENDAR] Could not record hit for {email}: {e}")
+
+def calendar_probe_order(invitee_email=None, organizer=None):
+    """Internal calendars, most likely to hold the invitee's meeting first.
+
+    Ranked by past hits for the invitee's domain, then overall hits; an
+    organizer hint naming an internal calendar goes before everything.
+    Without the store the calendars keep their plain sorted order.
+    """
+    domain = invitee_email.rpartition("@")[2] if invitee_email else None
+    try:
+        rows = get_store().execute(
+            "SELECT invitee_domain, calendar_id, hits FROM calendar_hits WHERE invitee_domain IN ('*', ?)", (domain,)
+        ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"[CALENDAR] Could not read calendar ranking: {e}")
+        rows = []
+    overall = {calendar_id: hits for invitee_domain, calendar_id, hits in rows if invitee_domain == "*"}
+    by_domain = {calendar_id: hits for invitee_domain, calendar_id, hits in rows if invitee_domain == domain}
+    organizer = organizer.lower() if organizer else None
+    return sorted(INTERNAL_EMAILS, key=lambda email: (
+        email != organizer, -by_domain.get(email, 0), -overall.get(email, 0), email
+    ))
+
+def calendar_hit_stats():
+    try:
+        rows = get_store().execute(
+            "SELECT calendar_id, hits FROM calendar_hits WHERE invitee_domain = '*' ORDER BY hits DESC LIMIT 5"
+        ).fetchall()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    return {"top_calendars": [{"calendar": calendar_id, "hits": hits} for calendar_id, hits in rows]}
+
+@traced("calendar_scan")
+def scan_internal_calendars(time_min, time_max, match_event, first_hit=False, log_prefix="[CALENDAR]",
+                            invitee=None, organizer=None, conclusive=None, calendars=None):
+    """Scan all internal calendars concurrently on a bounded worker pool.
+
+    match_event(email, event) returns a match or None for every listed event.
+    invitee, when given, is an attendee every match must list; calendars then
+    only return events mentioning it (unless CALENDAR_SERVER_FILTER is off).
+    Calendars are submitted in calendar_probe_order for the invitee. With
+    first_hit=True the scan stops at the first calendar that yields a match
+    and cancels the lookups that have not started yet. With first_hit or a
+    conclusive(match) predicate, the top CALENDAR_PRIORITY_PROBES calendars
+    are probed on their own first, and the rest are only listed when those
+    produced no (conclusive) match. Calendars still pending when
+    CALENDAR_SCAN_TIMEOUT or the request deadline expires are skipped.
+    calendars, when given, limits the scan to those internal calendars.
+    Returns a list of (email, match) tuples in completion order.
+    """
+    query = invitee if CALENDAR_SERVER_FILTER else None
+    
+    def scan_calendar(email):
+        matches = []
+        with span("calendar_scan.calendar", calendar=email):
+            for event in iter_calendar_events(email, time_min, time_max, query):
+                match = match_event(email, event)
+                if match is not None:
+                    matches.append(match)
+                    if first_hit:
+                        break
+        return matches
+    
+    def found(results):
+        if first_hit:
+            return bool(results)
+        return conclusive is not None and any(conclusive(match) for email, match in results)
+    
+    order = calendar_probe_order(invitee, organizer)
+    if calendars is not None:
+        order = [email for email in order if email in calendars]
+    if (first_hit or conclusive) and CALENDAR_PRIORITY_PROBES:
+        phases = [order[:CALENDAR_PRIORITY_PROBES], order[CALENDAR_PRIORITY_PROBES:]]
+    else:
+        phases = [order]
+    
+    scan_deadline = time.monotonic() + upstream_timeout(CALENDAR_SCAN_TIMEOUT)
+    executor = ThreadPoolExecutor(max_workers=CALENDAR_SCAN_CONCURRENCY, thread_name_prefix="calendar-scan")
+    results = []
+    try:
+        for phase_number, phase in enumerate(phases):
+            futures = {submit_in_context(executor, scan_calendar, email): email for email in phase}
+            try:
+                for future in as_completed(futures, timeout=max(0, scan_deadline - time.monotonic())):
+                    email = futures[future]
+                    try:
+                        matches = future.result()
+                    except Exception as e:
+                        logger.warning(f"{log_prefix} Error searching {email}'s calendar: {e}")
+                        continue
+                    results.extend((email, match) for match in matches)
+                    if first_hit and results:
+                        break
+            except TimeoutError:
+                pending = sum(1 for future in futures if not future.done())
+                pending += sum(len(later) for later in phases[phase_number + 1:])
+                logger.warning(f"{log_prefix} Calendar scan deadline reached, skipped {pending} calendar(s)")
+                mark_partial()
+                break
+            if found(results):
+                if phase_number < len(phases) - 1:
+                    logger.info(f"{log_prefix} Found in priority calendar(s), skipped {len(phases[-1])} calendar(s)")
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+@traced("candidate_events")
+def fetch_candidate_events(time_min, time_max, invitee, organizer=None, conclusive=None):
+    """Fetch every internal calendar event in the window that lists the invitee.
+
+    Returns (email, event) tuples that the Google Meet and Teams matchers can
+    share, so a unified check only sweeps the calendars once. When the
+    priority calendars already hold an event conclusive(event) accepts, the
+    other calendars are not listed. Calendars the local index covers are
+    answered from it; only the others are listed live.
+    """
+    invitee_email = invitee.lower()
+    
+    events, live_calendars = [], None
+    indexed = lookup_indexed_events(time_min, time_max, invitee_email)
+    if indexed is not None:
+        events, live_calendars = indexed
+        if not live_calendars or (conclusive and any(conclusive(event) for email, event in events)):
+            return events
+    
+    def match_event(email, event):
+        attendees_raw = event.get('attendees', [])
+        attendees = [a.get('email', '').lower() for a in attendees_raw if 'email' in a]
+        return event if invitee_email in attendees else None
+    
+    return events + scan_internal_calendars(time_min, time_max, match_event, log_prefix="[CALENDAR]",
+                                            invitee=invitee_email, organizer=organizer, conclusive=conclusive,
+                                            calendars=live_calendars)
+
+def match_google_meet_event(event, start_time_dt, end_time_dt, invitee_email):
+    """Return (meet_id, hangout_link) if the event is the invitee's Google Meet, else None"""
+    event_start_str = event.get('start', {}).get('dateTime', '')
+    event_end_str = event.get('end', {}).get('dateTime', '')
+    if not event_start_str or not event_end_str:
+        return None
+    event_start = parser.isoparse(event_start_str)
+    event_end = parser.isoparse(event_end_str)
+    # Within 60 min tolerance
+    if (abs(event_start - start_time_dt) > GOOGLE_MEET_TIME_BUFFER or 
+        abs(event_end - end_time_dt) > GOOGLE_MEET_TIME_BUFFER):
+        return None
+    attendees_raw = event.get('attendees', [])
+    attendees = [a.get('email', '').lower() for a in attendees_raw if 'email' in a]
+    if invitee_email not in attendees:
+        return None
+    hangout_link = event.get('hangoutLink', '')
+    if hangout_link and 'meet.google.com' in hangout_link:
+        meet_id = extract_meet_id(hangout_link)
+        if meet_id:
+            return meet_id, hangout_link
+    return None
+
+@traced("google_meet.find_meeting")
+def find_google_meet_id(start_time_dt, end_time_dt, invitee, calendar_events=None):
     # Search all internal calendars for the event, return the first Google Meet ID found
-    from googleapiclient.discovery import build
-    for email in INTERNAL_EMAILS:
-        try:
-            creds = get_calendar_credentials(email)
-            cal_service = build('calendar', 'v3', credentials=creds)
-            # Use a 5 minute buffer for time
-            time_buffer = timedelta(minutes=60)
-            events_result = cal_service.events().list(
-                calendarId=email,
-                timeMin=(start_time_dt - time_buffer).isoformat(),
-                timeMax=(end_time_dt + time_buffer).isoformat(),
-                singleEvents=True
-            ).execute()
-            events = events_result.get('items', [])
-            for event in events:
-                event_start_str = event.get('start', {}).get('dateTime', '')
-                event_end_str = event.get('end', {}).get('dateTime', '')
-                if not event_start_str or not event_end_str:
-                    continue
-                event_start = parser.isoparse(event_start_str)
-                event_end = parser.isoparse(event_end_str)
-                # Within 60 min tolerance
-                if (abs(event_start - start_time_dt) > timedelta(minutes=60) or 
-                    abs(event_end - end_time_dt) > timedelta(minutes=60)):
-                    continue
-                attendees_raw = event.get('attendees', [])
-                attendees = [a.get('email', '').lower() for a in attendees_raw if 'email' in a]
-                if invitee.lower() not in attendees:
-                    continue
-                hangout_link = event.get('hangoutLink', '')
-                if hangout_link and 'meet.google.com' in hangout_link:
-                    meet_id = extract_meet_id(hangout_link)
-                    if meet_id:
-                        logger.info(f"[GOOGLE MEET] Found Google Meet ID: {meet_id} in {email}'s calendar")
-                        return meet_id, hangout_link
-        except Exception as e:
-            logger.warning(f"Error searching {email}'s calendar: {e}")
-            continue
+    invitee_email = invitee.lower()
+    
+    live_calendars = None
+    if calendar_events is None:
+        indexed = lookup_indexed_events(
+            start_time_dt - GOOGLE_MEET_TIME_BUFFER, end_time_dt + GOOGLE_MEET_TIME_BUFFER, invitee_email
+        )
+        if indexed is not None:
+            calendar_events, live_calendars = indexed
+    
+    results = []
+    for email, event in calendar_events or []:
+        match = match_google_meet_event(event, start_time_dt, end_time_dt, invitee_email)
+        if match:
+            results.append((email, match))
+            break
+    
+    # Calendars the index doesn't cover (all of them without an index) are listed live
+    if not results and (calendar_events is None or live_calendars):
+        results = scan_internal_calendars(
+            start_time_dt - GOOGLE_MEET_TIME_BUFFER, end_time_dt + GOOGLE_MEET_TIME_BUFFER,
+            lambda email, event: match_google_meet_event(event, start_time_dt, end_time_dt, invitee_email),
+            first_hit=True, log_prefix="[GOOGLE MEET]", invitee=invitee_email, calendars=live_calendars
+        )
+    
+    if results:
+        email, (meet_id, hangout_link) = results[0]
+        logger.info(f"[GOOGLE MEET] Found Google Meet ID: {meet_id} in {email}'s calendar")
+        record_calendar_hit(email, invitee_email)
+        return meet_id, hangout_link
     logger.warning("[GOOGLE MEET] No matching meeting found in any calendar.")
     return None, None
 
-def check_google_meet(start_time_str, invitee):
+def iter_meet_activities(start_time, end_time, meeting_code=None):
+    """Yield Meet call_ended activities in a time window, one page at a time.
+
+    With meeting_code set, the Reports API filters activities server-side so
+    only that meeting's participants are returned.
+    """
+    # Audit logs store meeting codes in upper case without dashes
+    filters = f"meeting_code=={meeting_code.replace('-', '').upper()}" if meeting_code else None
+    http = GoogleApiHttp(get_reports_credentials())
+    page_token = None
+    while True:
+        response = get_reports_service().activities().list(
+            userKey='all',
+            applicationName='meet',
+            eventName='call_ended',
+            startTime=start_time,
+            endTime=end_time,
+            filters=filters,
+            maxResults=REPORTS_PAGE_SIZE,
+            pageToken=page_token,
+            fields=REPORTS_ACTIVITY_FIELDS
+        ).execute(http=http)
+        yield from response.get('items', [])
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return
+
+def iter_meet_participants(activities):
+    """Yield (meeting_code, email, host, activity_time) for every call_ended event"""
+    for activity in activities:
+        actor = activity.get("actor", {})
+        activity_time = activity.get("id", {}).get("time", "unknown")
+        for event in activity.get("events", []):
+            params = {p['name']: p.get('value') or p.get('boolValue') for p in event.get("parameters", [])}
+            meeting_code = params.get("meeting_code", "").lower()
+            if not meeting_code:
+                continue
+            email = params.get("identifier") or actor.get("email") or ""
+            yield meeting_code, email.lower(), params.get("organizer_email"), activity_time
+
+def add_meet_participant(meetings, meeting_code, email, host, activity_time):
+    """Add one participant to the per-meeting attendee, internal and external sets"""
+    if meeting_code not in meetings:
+        meetings[meeting_code] = {
+            "attendees": set(),
+            "internal_participants": set(),
+            "external_participants": set(),
+            "host": host,
+            "time": activity_time
+        }
+    is_email = "@" in email
+    is_internal = is_internal_email(email)
+    if is_internal:
+        email = internal_identities.canonical(email)
+    if is_email:
+        meetings[meeting_code]["attendees"].add(email)
+        if is_internal:
+            meetings[meeting_code]["internal_participants"].add(email)
+        else:
+            meetings[meeting_code]["external_participants"].add(email)
+
+def aggregate_meet_activities(activities, meeting_code=None):
+    """Group call_ended activities into per-meeting attendee sets.
+
+    With meeting_code set, state is only built for that meeting.
+    """
+    meetings = {}
+    for code, email, host, activity_time in iter_meet_participants(activities):
+        if meeting_code and code != meeting_code:
+            continue
+        add_meet_participant(meetings, code, email, host, activity_time)
+    return meetings
+
+def meet_report_window(start_time_dt):
+    """Reports API window for a Google Meet check: start_time to start_time + 1 hour"""
+    end_time_dt = start_time_dt + timedelta(hours=1)
+    # Always output in UTC ISO with 'Z'
+    return start_time_dt.strftime("%Y-%m-%dT%H:%M:%SZ"), end_time_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+@traced("google_meet")
+def check_google_meet(start_time_str, invitee, calendar_events=None, batch_window=None):
     """Check Google Meet meetings - uses only start_time internally"""
     try:
         # Parse start time
         start_time_dt = parser.isoparse(start_time_str)
         # Google Meet logic: always use start_time + 1 hour for end_time
         end_time_dt = start_time_dt + timedelta(hours=1)
-        
-        # Always output in UTC ISO with 'Z'
-        start_time = start_time_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-        end_time = end_time_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        start_time, end_time = meet_report_window(start_time_dt)
         
         logger.info(f"[GOOGLE MEET] Searching for meetings between {start_time} and {end_time}")
         logger.info(f"[GOOGLE MEET] Looking for invitee: {invitee}")
         
         # Find Google Meet ID from calendar
-        calendar_meeting_id, meet_link = find_google_meet_id(start_time_dt, end_time_dt, invitee)
+        calendar_meeting_id, meet_link = find_google_meet_id(start_time_dt, end_time_dt, invitee, calendar_events)
         
         if not calendar_meeting_id:
             return {
@@ -182,43 +1169,17 @@ def check_google_meet(start_time_str, invitee):
                 "message": "No Google Meet event found in calendar"
             }
         
-        # Fetch Google Meet activities
-        response = service.activities().list(
-            userKey='all',
-            applicationName='meet',
-            eventName='call_ended',
-            startTime=start_time,
-            endTime=end_time
-        ).execute()
-        
-        meetings = {}
-        for activity in response.get('items', []):
-            actor = activity.get("actor", {})
-            activity_time = activity.get("id", {}).get("time", "unknown")
-            for event in activity.get("events", []):
-                params = {p['name']: p.get('value') or p.get('boolValue') for p in event.get("parameters", [])}
-                meeting_code = params.get("meeting_code", "").lower()
-                if not meeting_code:
-                    continue
-                if meeting_code not in meetings:
-                    meetings[meeting_code] = {
-                        "attendees": set(),
-                        "internal_participants": set(),
-                        "external_participants": set(),
-                        "host": params.get("organizer_email"),
-                        "time": activity_time
-                    }
-                email = params.get("identifier") or actor.get("email") or ""
-                email = email.lower()
-                is_email = "@" in email
-                is_internal = email.endswith("@" + ORG_DOMAIN)
-                is_external = is_email and not is_internal
-                if is_email:
-                    meetings[meeting_code]["attendees"].add(email)
-                    if is_internal:
-                        meetings[meeting_code]["internal_participants"].add(email)
-                    else:
-                        meetings[meeting_code]["external_participants"].add(email)
+        # Answer from the local audit-log store when it covers this window,
+        # otherwise fetch Google Meet activities for this meeting code only
+        meetings = lookup_stored_meeting(calendar_meeting_id, start_time_dt, end_time_dt)
+        if meetings is None:
+            if batch_window:
+                activities = batch_window.meet_activities(start_time, end_time)
+            else:
+                activities = iter_meet_activities(start_time, end_time, meeting_code=calendar_meeting_id)
+            meetings = aggregate_meet_activities(activities, meeting_code=calendar_meeting_id)
+        else:
+            logger.info(f"[GOOGLE MEET] Answered {calendar_meeting_id} from local audit-log store")
         
         # Check if the calendar meeting was found in audit logs
         if calendar_meeting_id in meetings:
@@ -273,6 +1234,236 @@ def check_google_meet(start_time_str, invitee):
             "error": str(e)
         }
 
+# ===================== CALENDAR EVENT INDEX =====================
+
+def index_calendar_event(conn, email, event):
+    """Replace an event in the local index; cancelled and all-day events are removed"""
+    event_id = event.get('id')
+    if not event_id:
+        return
+    conn.execute("DELETE FROM calendar_events WHERE calendar_id = ? AND event_id = ?", (email, event_id))
+    conn.execute("DELETE FROM calendar_attendees WHERE calendar_id = ? AND event_id = ?", (email, event_id))
+    event_start_str = event.get('start', {}).get('dateTime', '')
+    event_end_str = event.get('end', {}).get('dateTime', '')
+    if event.get('status') == 'cancelled' or not event_start_str or not event_end_str:
+        return
+    conn.execute(
+        "INSERT INTO calendar_events VALUES (?, ?, ?, ?, ?)",
+        (email, event_id, parser.isoparse(event_start_str).timestamp(),
+         parser.isoparse(event_end_str).timestamp(), json.dumps(event))
+    )
+    attendees = {a.get('email', '').lower() for a in event.get('attendees', []) if a.get('email')}
+    conn.executemany(
+        "INSERT INTO calendar_attendees VALUES (?, ?, ?)",
+        [(attendee, email, event_id) for attendee in attendees]
+    )
+
+def sync_calendar(email):
+    """Bring one calendar's index up to date using Calendar incremental sync"""
+    conn = get_store()
+    row = conn.execute("SELECT sync_token, covered_from FROM calendar_sync WHERE calendar_id = ?", (email,)).fetchone()
+    sync_token, covered_from = row if row else (None, None)
+    started_at = time.time()
+    
+    if sync_token:
+        params = {"syncToken": sync_token}
+    else:
+        # Full sync: drop what we have and mark the calendar unsynced until it completes
+        covered_from = started_at - CALENDAR_SYNC_LOOKBACK_DAYS * 86400
+        with conn:
+            conn.execute("DELETE FROM calendar_events WHERE calendar_id = ?", (email,))
+            conn.execute("DELETE FROM calendar_attendees WHERE calendar_id = ?", (email,))
+            conn.execute("INSERT OR REPLACE INTO calendar_sync VALUES (?, NULL, ?, NULL)", (email, covered_from))
+        params = {"timeMin": format_utc_time(covered_from)}
+    
+    try:
+        next_sync_token = None
+        changed = 0
+        for events_result in iter_calendar_pages(email, **params):
+            with conn:
+                for event in events_result.get('items', []):
+                    index_calendar_event(conn, email, event)
+                    changed += 1
+            next_sync_token = events_result.get('nextSyncToken', next_sync_token)
+    except HttpError as e:
+        if e.resp.status == 410:
+            # Sync token expired: start over with a full sync
+            logger.info(f"[CALENDAR INDEX] Sync token for {email} expired, resyncing")
+            with conn:
+                conn.execute("DELETE FROM calendar_sync WHERE calendar_id = ?", (email,))
+            return sync_calendar(email)
+        raise
+    
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO calendar_sync VALUES (?, ?, ?, ?)",
+                     (email, next_sync_token, covered_from, started_at))
+        conn.execute("DELETE FROM calendar_sync_failures WHERE calendar_id = ?", (email,))
+    return changed
+
+def record_sync_failure(email, error):
+    """Back a failing calendar off exponentially, up to CALENDAR_SYNC_MAX_BACKOFF between attempts"""
+    with get_store() as conn:
+        row = conn.execute("SELECT failures FROM calendar_sync_failures WHERE calendar_id = ?", (email,)).fetchone()
+        failures = (row[0] if row else 0) + 1
+        backoff = min(CALENDAR_SYNC_INTERVAL * 2 ** min(failures, 16), CALENDAR_SYNC_MAX_BACKOFF)
+        conn.execute("INSERT OR REPLACE INTO calendar_sync_failures VALUES (?, ?, ?, ?)",
+                     (email, failures, str(error)[:500], time.time() + backoff))
+
+def sync_calendars():
+    """Sync every internal calendar into the local index, skipping failing ones until their backoff ends"""
+    changed = 0
+    backing_off = {calendar_id for (calendar_id,) in get_store().execute(
+        "SELECT calendar_id FROM calendar_sync_failures WHERE retry_at > ?", (time.time(),)
+    )}
+    calendars = [email for email in INTERNAL_EMAILS if email not in backing_off]
+    executor = ThreadPoolExecutor(max_workers=CALENDAR_SCAN_CONCURRENCY, thread_name_prefix="calendar-sync")
+    futures = {executor.submit(sync_calendar, email): email for email in calendars}
+    for future in as_completed(futures):
+        try:
+            changed += future.result()
+        except Exception as e:
+            logger.warning(f"[CALENDAR INDEX] Failed to sync {futures[future]}: {e}")
+            record_sync_failure(futures[future], e)
+    executor.shutdown()
+    logger.info(f"[CALENDAR INDEX] Synced {len(futures)} calendar(s), {changed} changed event(s), "
+                f"{len(backing_off)} failing calendar(s) backed off")
+
+@traced("calendar_index.lookup")
+def lookup_indexed_events(time_min, time_max, invitee_email):
+    """Find indexed events with the invitee that overlap the window.
+
+    Returns (events, live_calendars): (email, event) tuples like
+    fetch_candidate_events from every calendar whose index is fresh and
+    covers the window, and the internal calendars it doesn't cover, which
+    the caller lists live. None when the index is disabled or covers no
+    calendar.
+    """
+    if CALENDAR_SYNC_INTERVAL <= 0:
+        return None
+    try:
+        conn = get_store()
+        sync_rows = conn.execute("SELECT calendar_id, covered_from, synced_at FROM calendar_sync").fetchall()
+        synced = {calendar_id: (covered_from, synced_at) for calendar_id, covered_from, synced_at in sync_rows}
+        oldest_allowed = time.time() - CALENDAR_INDEX_MAX_STALENESS
+        covered = set()
+        for email in INTERNAL_EMAILS:
+            covered_from, synced_at = synced.get(email, (None, None))
+            if synced_at is not None and synced_at >= oldest_allowed and time_min.timestamp() >= covered_from:
+                covered.add(email)
+        if not covered:
+            return None
+        rows = conn.execute(
+            "SELECT e.calendar_id, e.event_json FROM calendar_attendees a "
+            "JOIN calendar_events e ON e.calendar_id = a.calendar_id AND e.event_id = a.event_id "
+            "WHERE a.email = ? AND e.end_ts > ? AND e.start_ts < ?",
+            (invitee_email, time_min.timestamp(), time_max.timestamp())
+        ).fetchall()
+    except Exception as e:
+        logger.warning(f"[CALENDAR INDEX] Lookup failed: {e}")
+        return None
+    events = [(email, json.loads(event_json)) for email, event_json in rows if email in covered]
+    return events, sorted(INTERNAL_EMAILS - covered)
+
+def calendar_index_stats():
+    try:
+        conn = get_store()
+        sync_rows = conn.execute("SELECT calendar_id, synced_at FROM calendar_sync").fetchall()
+        failure_rows = conn.execute(
+            "SELECT calendar_id, failures, last_error, retry_at FROM calendar_sync_failures ORDER BY calendar_id"
+        ).fetchall()
+    except Exception as e:
+        return {"error": str(e)}
+    synced_at = [ts for calendar_id, ts in sync_rows if calendar_id in INTERNAL_EMAILS and ts]
+    return {
+        "enabled": CALENDAR_SYNC_INTERVAL > 0,
+        "calendars_synced": len(synced_at),
+        "calendars_total": len(INTERNAL_EMAILS),
+        "staleness_seconds": round(time.time() - min(synced_at)) if synced_at else None,
+        "failing_calendars": [
+            {"calendar": calendar_id, "failures": failures, "last_error": last_error,
+             "retry_at": format_utc_time(retry_at)}
+            for calendar_id, failures, last_error, retry_at in failure_rows if calendar_id in INTERNAL_EMAILS
+        ]
+    }
+
+# ===================== MEET AUDIT LOG STORE =====================
+
+def ingest_meet_activities():
+    """Pull call_ended activities since the high-water mark into the local store.
+
+    Lookups are answered up to MEET_AUDIT_LATENCY before the poll. Entries
+    can still arrive later than that, until results are cached as final
+    RESULT_FINALITY_DELAY after a meeting, so every poll re-reads at least
+    that far back; duplicates are ignored on insert.
+    """
+    now = time.time()
+    covered_end = get_store_state("meet_covered_end")
+    if covered_end is None:
+        covered_end = now - MEET_INGEST_BACKFILL_HOURS * 3600
+    read_from = min(covered_end, now - max(MEET_AUDIT_LATENCY, RESULT_FINALITY_DELAY))
+    
+    conn = get_store()
+    rows = []
+    ingested = 0
+    for meeting_code, email, host, activity_time in iter_meet_participants(
+            iter_meet_activities(format_utc_time(read_from), format_utc_time(now))):
+        rows.append((meeting_code, email, parser.isoparse(activity_time).timestamp(), host))
+        if len(rows) >= 500:
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO meet_participants VALUES (?, ?, ?, ?)", rows)
+            ingested += len(rows)
+            rows = []
+    
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO meet_participants VALUES (?, ?, ?, ?)", rows)
+        if get_store_state("meet_covered_start") is None:
+            set_store_state(conn, "meet_covered_start", covered_end)
+        set_store_state(conn, "meet_covered_end", max(covered_end, now - MEET_AUDIT_LATENCY))
+    ingested += len(rows)
+    logger.info(f"[MEET STORE] Ingested {ingested} participant event(s) since {format_utc_time(read_from)}")
+
+@traced("meet_store.lookup")
+def lookup_stored_meeting(meeting_code, start_time_dt, end_time_dt):
+    """Look up a meeting's participant sets in the local store.
+
+    Returns None when the store has not ingested the whole window yet, so the
+    caller falls back to the live Reports API.
+    """
+    if MEET_INGEST_INTERVAL <= 0:
+        return None
+    try:
+        covered_start = get_store_state("meet_covered_start")
+        covered_end = get_store_state("meet_covered_end")
+        start_ts, end_ts = start_time_dt.timestamp(), end_time_dt.timestamp()
+        if covered_start is None or start_ts < covered_start or end_ts > covered_end:
+            return None
+        rows = get_store().execute(
+            "SELECT email, host, activity_time FROM meet_participants "
+            "WHERE meeting_code = ? AND activity_time >= ? AND activity_time <= ? ORDER BY activity_time",
+            (meeting_code, start_ts, end_ts)
+        ).fetchall()
+    except Exception as e:
+        logger.warning(f"[MEET STORE] Lookup failed: {e}")
+        return None
+    
+    meetings = {}
+    for email, host, activity_time in rows:
+        add_meet_participant(meetings, meeting_code, email, host, format_utc_time(activity_time))
+    return meetings
+
+def meet_store_stats():
+    try:
+        covered_start = get_store_state("meet_covered_start")
+        covered_end = get_store_state("meet_covered_end")
+    except Exception as e:
+        return {"error": str(e)}
+    return {
+        "enabled": MEET_INGEST_INTERVAL > 0,
+        "covered_start": format_utc_time(covered_start) if covered_start else None,
+        "covered_end": format_utc_time(covered_end) if covered_end else None,
+        "lag_seconds": round(time.time() - covered_end) if covered_end else None
+    }
+
 # ===================== MICROSOFT TEAMS FUNCTIONS =====================
 
 def validate_datetime_input(datetime_str):
@@ -286,18 +1477,18 @@ def detect_teams_meeting(event):
     location = event.get('location', '').lower()
     description = event.get('description', '').lower()
     
-    teams_indicators = ['teams.microsoft.com', 'teams.live.com', 'teams meeting', 'calendly.com']
+    if not any(indicator in location or indicator in description for indicator in TEAMS_INDICATORS):
+        return None
+    
+    text = location + ' ' + description
+    if 'calendly.com' in location or 'calendly.com' in description:
+        calendly_match = CALENDLY_LINK_RE.search(text)
+        if calendly_match:
+            return calendly_match.group(0)
     
-    for indicator in teams_indicators:
-        if indicator in location or indicator in description:
-            if 'calendly.com' in location or 'calendly.com' in description:
-                calendly_match = re.search(r'https://[^\s]*calendly[^\s]*', location + ' ' + description)
-                if calendly_match:
-                    return calendly_match.group(0)
-            
-            teams_link_match = re.search(r'https://[^\s]*teams[^\s]*', location + ' ' + description)
-            if teams_link_match:
-                return teams_link_match.group(0)
+    teams_link_match = TEAMS_LINK_RE.search(text)
+    if teams_link_match:
+        return teams_link_match.group(0)
     
     return None
 
@@ -312,125 +1503,258 @@ def extract_teams_id_from_direct_url(teams_url):
         logger.info(f"URL decoded from: {original_url}")
         logger.info(f"URL decoded to: {teams_url}")
     
-    patterns = [
-        r'(19:meeting_[^/\s@\?]+@thread\.v2)',
-        r'(meeting_[^/\s@\?]+@thread\.v2)',
-        r'19%3Ameeting_([^%/\s@\?]+)%40thread\.v2',
-        r'meeting_([^%/\s@\?]+)%40thread\.v2',
-        r'teams\.microsoft\.com/.*meetup-join/(\d+)/(\w+)',
-        r'teams\.microsoft\.com/l/meetup-join/([^/\?]+)',
-        r'thread\.v2/([^/\?]+)',
-        r'meetingId=([^&\s]+)',
-        r'conference[Ii]d=([^&\s]+)',
-        r'teams\.live\.com/meet/([^/\?]+)',
-        r'orgid=([^&\s]+)',
-        r'meetings/([A-Za-z0-9+/=_-]+)',
-        r'join/([A-Za-z0-9+/=_-]+)',
-    ]
-    
-    for i, pattern in enumerate(patterns):
-        match = re.search(pattern, teams_url, re.IGNORECASE)
-        if match:
-            if i < 4:
-                if match.group(0).startswith('19:'):
-                    meeting_id = match.group(0)
-                elif match.group(0).startswith('meeting_'):
-                    meeting_id = f"19:{match.group(0)}"
-                else:
-                    encoded_part = match.group(1)
-                    meeting_id = f"19:meeting_{encoded_part}@thread.v2"
+    i, match = first_match(TEAMS_ID_PATTERNS, teams_url)
+    if match:
+        if i < 4:
+            if match.group(0).startswith('19:'):
+                meeting_id = match.group(0)
+            elif match.group(0).startswith('meeting_'):
+                meeting_id = f"19:{match.group(0)}"
             else:
-                meeting_id = match.group(1) if len(match.groups()) == 1 else f"{match.group(1)}_{match.group(2)}"
-            
-            logger.info(f"Extracted Teams meeting ID using pattern {i}: {meeting_id}")
-            return meeting_id
+                encoded_part = match.group(1)
+                meeting_id = f"19:meeting_{encoded_part}@thread.v2"
+        else:
+            meeting_id = match.group(1) if len(match.groups()) == 1 else f"{match.group(1)}_{match.group(2)}"
+        
+        logger.info(f"Extracted Teams meeting ID using pattern {i}: {meeting_id}")
+        return meeting_id
     
     logger.warning(f"Could not extract meeting ID from Teams URL: {teams_url}")
     return None
 
+def resolve_calendly_link(calendly_link):
+    """Follow a Calendly link to the Teams meeting behind it; returns the meeting ID or None"""
+    logger.info(f"Following Calendly redirect for: {calendly_link}")
+    
+    response = calendly_session.head(calendly_link, allow_redirects=True,
+                                     timeout=upstream_timeout(CALENDLY_TIMEOUT))
+    final_url = response.url
+    
+    logger.info(f"Calendly redirect led to: {final_url}")
+    
+    if 'teams.microsoft.com' in final_url or 'teams.live.com' in final_url:
+        teams_id = extract_teams_id_from_direct_url(final_url)
+        if teams_id:
+            logger.info(f"Successfully extracted Teams ID from Calendly redirect: {teams_id}")
+            return teams_id
+    
+    try:
+        logger.info("HEAD request didn't find Teams URL, trying GET request...")
+        get_response = calendly_session.get(calendly_link, allow_redirects=True,
+                                            timeout=upstream_timeout(CALENDLY_TIMEOUT))
+        
+        if get_response.status_code == 200:
+            content = get_response.text
+            
+            i, match = first_match(CALENDLY_PAGE_PATTERNS, content)
+            if match:
+                teams_url = match.group(1) if i == 2 else match.group(0)
+                if not teams_url.startswith('http') and ('meeting_' in teams_url or 'thread.v2' in teams_url):
+                    if not teams_url.startswith('19:'):
+                        teams_url = f"19:{teams_url}"
+                    logger.info(f"Extracted meeting ID from page content: {teams_url}")
+                    return teams_url
+                else:
+                    teams_id = extract_teams_id_from_direct_url(teams_url)
+                    if teams_id:
+                        logger.info(f"Extracted from page content URL: {teams_id}")
+                        return teams_id
+                            
+    except DeadlineExceeded:
+        raise
+    except Exception as content_e:
+        logger.warning(f"Failed to parse Calendly page content: {content_e}")
+    
+    return None
+
+def calendly_fallback_id(calendly_link):
+    match = re.search(r'calendly\.com/events/([^/\?]+)', calendly_link)
+    return f"calendly_{match.group(1)}" if match else None
+
+# Calendly link resolutions in flight, so concurrent lookups of one link share a single fetch
+_calendly_inflight = {}
+_calendly_lock = threading.Lock()
+calendly_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+@traced("calendly.resolve")
+def lookup_calendly_link(calendly_link):
+    """Resolve a Calendly link through the persistent cache.
+
+    Teams meeting IDs are kept for CALENDLY_CACHE_TTL; links that could not be
+    resolved keep their calendly_ fallback ID for CALENDLY_NEGATIVE_CACHE_TTL.
+    Store errors count as a cache miss or a skipped write.
+    """
+    try:
+        row = get_store().execute(
+            "SELECT meeting_id FROM calendly_links WHERE url = ? AND expires_at > ?", (calendly_link, time.time())
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"[CALENDLY] Could not read link cache: {e}")
+        row = None
+    if row:
+        with _calendly_lock:
+            calendly_stats["hits"] += 1
+        return row[0]
+    
+    with _calendly_lock:
+        future = _calendly_inflight.get(calendly_link)
+        leader = future is None
+        if leader:
+            future = _calendly_inflight[calendly_link] = Future()
+            calendly_stats["misses"] += 1
+        else:
+            calendly_stats["coalesced"] += 1
+    if not leader:
+        try:
+            return future.result(timeout=upstream_timeout(2 * CALENDLY_TIMEOUT))
+        except TimeoutError:
+            return calendly_fallback_id(calendly_link)
+    
+    try:
+        try:
+            teams_id = resolve_calendly_link(calendly_link)
+        except DeadlineExceeded:
+            # Out of time, not a property of the link: answer without caching
+            teams_id = None
+            ttl = None
+        except Exception as e:
+            logger.warning(f"Failed to follow Calendly redirect: {e}")
+            teams_id = None
+            ttl = CALENDLY_NEGATIVE_CACHE_TTL
+        else:
+            ttl = CALENDLY_CACHE_TTL if teams_id else CALENDLY_NEGATIVE_CACHE_TTL
+        meeting_id = teams_id or calendly_fallback_id(calendly_link)
+        if not teams_id and meeting_id:
+            logger.info(f"Using Calendly ID as fallback: {meeting_id}")
+        if ttl:
+            try:
+                with get_store() as conn:
+                    conn.execute("INSERT OR REPLACE INTO calendly_links (url, meeting_id, expires_at) "
+                                 "VALUES (?, ?, ?)", (calendly_link, meeting_id, time.time() + ttl))
+            except sqlite3.Error as e:
+                logger.warning(f"[CALENDLY] Could not cache {calendly_link}: {e}")
+        future.set_result(meeting_id)
+        return meeting_id
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _calendly_lock:
+            _calendly_inflight.pop(calendly_link, None)
+
+def calendly_cache_stats():
+    try:
+        row = get_store().execute(
+            "SELECT COUNT(*), SUM(meeting_id LIKE 'calendly_%' OR meeting_id IS NULL) FROM calendly_links "
+            "WHERE expires_at > ?", (time.time(),)
+        ).fetchone()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    with _calendly_lock:
+        return {"links": row[0], "unresolved": row[1] or 0, **calendly_stats}
+
 def extract_teams_meeting_id_enhanced(teams_link):
     """Enhanced Teams meeting ID extraction with Calendly redirect following"""
     if not teams_link:
         return None
     
     if 'calendly.com' in teams_link:
-        try:
-            logger.info(f"Following Calendly redirect for: {teams_link}")
-            
-            session = requests.Session()
-            session.max_redirects = 10
-            
-            response = session.head(teams_link, allow_redirects=True, timeout=20)
-            final_url = response.url
-            
-            logger.info(f"Calendly redirect led to: {final_url}")
-            
-            if 'teams.microsoft.com' in final_url or 'teams.live.com' in final_url:
-                teams_id = extract_teams_id_from_direct_url(final_url)
-                if teams_id:
-                    logger.info(f"Successfully extracted Teams ID from Calendly redirect: {teams_id}")
-                    return teams_id
-            
-            try:
-                logger.info("HEAD request didn't find Teams URL, trying GET request...")
-                get_response = session.get(teams_link, allow_redirects=True, timeout=20)
-                
-                if get_response.status_code == 200:
-                    content = get_response.text
-                    
-                    teams_patterns = [
-                        r'https://teams\.microsoft\.com/l/meetup-join/[^\s"\']+',
-                        r'https://teams\.live\.com/meet/[^\s"\']+',
-                        r'"joinUrl":"([^"]*teams[^"]*)"',
-                        r'teams\.microsoft\.com[^"\']*',
-                        r'19:meeting_[^"\'@\s]+@thread\.v2',
-                        r'meeting_[^"\'@\s]+@thread\.v2'
-                    ]
-                    
-                    for pattern in teams_patterns:
-                        match = re.search(pattern, content, re.IGNORECASE)
-                        if match:
-                            teams_url = match.group(1) if 'joinUrl' in pattern else match.group(0)
-                            if not teams_url.startswith('http') and ('meeting_' in teams_url or 'thread.v2' in teams_url):
-                                if not teams_url.startswith('19:'):
-                                    teams_url = f"19:{teams_url}"
-                                logger.info(f"Extracted meeting ID from page content: {teams_url}")
-                                return teams_url
-                            else:
-                                teams_id = extract_teams_id_from_direct_url(teams_url)
-                                if teams_id:
-                                    logger.info(f"Extracted from page content URL: {teams_id}")
-                                    return teams_id
-                                    
-            except Exception as content_e:
-                logger.warning(f"Failed to parse Calendly page content: {content_e}")
-            
-            match = re.search(r'calendly\.com/events/([^/\?]+)', teams_link)
-            if match:
-                calendly_id = f"calendly_{match.group(1)}"
-                logger.info(f"Using Calendly ID as fallback: {calendly_id}")
-                return calendly_id
-                
-        except Exception as e:
-            logger.warning(f"Failed to follow Calendly redirect: {e}")
-            match = re.search(r'calendly\.com/events/([^/\?]+)', teams_link)
-            if match:
-                return f"calendly_{match.group(1)}"
+        meeting_id = lookup_calendly_link(teams_link)
+        if meeting_id:
+            return meeting_id
     
     return extract_teams_id_from_direct_url(teams_link)
 
+# Process-wide Graph app token, refreshed in the background before it expires
+_msal_lock = threading.Lock()
+_msal_app = None
+_msal_cache = None
+_app_token = {"access_token": None, "expires_at": 0}
+_token_refresher = None
+token_stats = {"cache_hits": 0, "token_fetches": 0}
+
+def get_msal_app():
+    """Get the shared MSAL client, loading the persisted token cache if configured"""
+    global _msal_app, _msal_cache
+    if _msal_app is None:
+        if missing_vars:
+            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+        _msal_cache = msal.SerializableTokenCache()
+        if MSAL_TOKEN_CACHE_FILE and os.path.exists(MSAL_TOKEN_CACHE_FILE):
+            with open(MSAL_TOKEN_CACHE_FILE) as f:
+                _msal_cache.deserialize(f.read())
+        _msal_app = msal.ConfidentialClientApplication(
+            MICROSOFT_CLIENT_ID, authority=AUTHORITY, client_credential=MICROSOFT_CLIENT_SECRET,
+            token_cache=_msal_cache, http_client=http_session, timeout=UPSTREAM_TIMEOUT
+        )
+    return _msal_app
+
+def _app_token_is_fresh(margin):
+    return _app_token["access_token"] and _app_token["expires_at"] - time.time() > margin
+
+def refresh_app_token(margin=None):
+    """Acquire a Graph app token through MSAL unless the current one is still fresher than margin"""
+    with _msal_lock:
+        if margin is not None and _app_token_is_fresh(margin):
+            token_stats["cache_hits"] += 1
+            return _app_token["access_token"]
+        token_resp = get_msal_app().acquire_token_for_client(scopes=SCOPE)
+        if "access_token" not in token_resp:
+            raise RuntimeError(f"Token error: {token_resp.get('error_description')}")
+        if _msal_cache.has_state_changed:
+            token_stats["token_fetches"] += 1
+            if MSAL_TOKEN_CACHE_FILE:
+                with open(MSAL_TOKEN_CACHE_FILE, "w") as f:
+                    f.write(_msal_cache.serialize())
+            _msal_cache.has_state_changed = False
+        else:
+            token_stats["cache_hits"] += 1
+        _app_token["access_token"] = token_resp["access_token"]
+        _app_token["expires_at"] = time.time() + int(token_resp.get("expires_in", 3600))
+        return _app_token["access_token"]
+
+# MSAL returns its cached token until it is this close to expiry
+MSAL_REFRESH_WINDOW = 300
+TOKEN_REFRESH_MIN_INTERVAL = 30  # seconds between background refreshes that got the cached token back
+
+def _token_refresh_loop():
+    # Waking up before MSAL's window would only get the cached token back
+    margin = min(TOKEN_REFRESH_MARGIN, MSAL_REFRESH_WINDOW - TOKEN_REFRESH_MIN_INTERVAL)
+    while True:
+        try:
+            delay = _app_token["expires_at"] - margin - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            fetches = token_stats["token_fetches"]
+            refresh_app_token()
+            if token_stats["token_fetches"] == fetches:
+                time.sleep(TOKEN_REFRESH_MIN_INTERVAL)
+            else:
+                logger.info("[TEAMS] Refreshed Graph app token")
+        except Exception as e:
+            logger.warning(f"[TEAMS] Graph app token refresh failed: {e}")
+            time.sleep(30)
+
+def start_token_refresher():
+    """Start the background thread that keeps the Graph app token fresh"""
+    global _token_refresher
+    with _msal_lock:
+        if _token_refresher is None:
+            _token_refresher = threading.Thread(target=_token_refresh_loop, name="token-refresher", daemon=True)
+            _token_refresher.start()
+
 def get_app_token():
     """Get application token using client credentials"""
-    app = msal.ConfidentialClientApplication(
-        MICROSOFT_CLIENT_ID, authority=AUTHORITY, client_credential=MICROSOFT_CLIENT_SECRET
-    )
-    token_resp = app.acquire_token_for_client(scopes=SCOPE)
-    if "access_token" not in token_resp:
-        raise RuntimeError(f"Token error: {token_resp.get('error_description')}")
-    return token_resp["access_token"]
+    if _app_token_is_fresh(TOKEN_REFRESH_MARGIN / 2):
+        with _msal_lock:
+            token_stats["cache_hits"] += 1
+        return _app_token["access_token"]
+    token = refresh_app_token(margin=TOKEN_REFRESH_MARGIN / 2)
+    start_token_refresher()
+    return token
 
 def find_meetings_in_timerange(token, start_time, end_time):
-    """Find all meetings in a specific time range"""
+    """Yield all meetings in a specific time range, following @odata.nextLink page by page"""
     headers = {"Authorization": f"Bearer {token}"}
     
     if start_time.endswith('Z'):
@@ -448,38 +1772,82 @@ def find_meetings_in_timerange(token, start_time, end_time):
     
     from urllib.parse import quote
     filter_query = f"startDateTime ge {start_filter} and startDateTime lt {end_filter}"
-    url = f"{GRAPH_BETA}/communications/callRecords?$filter={quote(filter_query)}"
+    url = f"{GRAPH_BETA}/communications/callRecords?$filter={quote(filter_query)}&$select={CALL_RECORD_LIST_SELECT}"
     
     logger.info(f"[TEAMS] Searching for meetings between: {start_time} and {end_time}")
     
-    try:
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
+    pages = 0
+    while url:
+        try:
+            resp = http_session.get(url, headers=headers, timeout=upstream_timeout())
+            if resp.status_code != 200:
+                logger.error(f"[TEAMS] Error: {resp.status_code} - {resp.text}")
+                mark_partial()
+                return
             data = resp.json()
-            records = data.get("value", [])
-            logger.info(f"[TEAMS] Found {len(records)} meeting(s) in this time range")
-            return records
-        else:
-            logger.error(f"[TEAMS] Error: {resp.status_code} - {resp.text}")
-            return []
-    except Exception as e:
-        logger.error(f"[TEAMS] Exception: {e}")
-        return []
+        except Exception as e:
+            logger.error(f"[TEAMS] Exception: {e}")
+            # The records listed so far may not include the meeting
+            mark_partial()
+            return
+        records = data.get("value", [])
+        pages += 1
+        logger.info(f"[TEAMS] Page {pages}: {len(records)} meeting(s) in this time range")
+        yield from records
+        url = data.get("@odata.nextLink")
 
+# Detailed call records, shared by requests that look at the same window
+call_record_cache = LRUCache(CALL_RECORD_CACHE_SIZE, ttl=CALL_RECORD_CACHE_TTL)
+
+@traced("teams.call_record_details")
 def get_call_record_details(token, record_id):
     """Get full call record with sessions and segments to extract participants"""
+    cached = call_record_cache.get(record_id)
+    if cached is not None:
+        return cached
+    
     headers = {"Authorization": f"Bearer {token}"}
-    url = f"{GRAPH_BETA}/communications/callRecords/{record_id}?$expand=sessions($expand=segments)"
+    url = (f"{GRAPH_BETA}/communications/callRecords/{record_id}"
+           f"?$select={CALL_RECORD_SELECT}&$expand=sessions($expand=segments)")
     
     try:
-        resp = requests.get(url, headers=headers)
+        resp = http_session.get(url, headers=headers, timeout=upstream_timeout())
         if resp.status_code == 200:
-            return resp.json()
+            details = resp.json()
+            call_record_cache.set(record_id, details)
+            return details
     except:
         pass
     
     return None
 
+def iter_call_record_details(token, records):
+    """Yield (record, details) in input order while fetching details concurrently.
+
+    At most CALL_RECORD_FETCH_CONCURRENCY fetches run ahead of the consumer, and
+    fetches not yet started are cancelled once the caller stops iterating.
+    """
+    executor = ThreadPoolExecutor(max_workers=CALL_RECORD_FETCH_CONCURRENCY, thread_name_prefix="call-records")
+    records = iter(records)
+    pending = deque()
+    
+    def fill():
+        while len(pending) < CALL_RECORD_FETCH_CONCURRENCY:
+            record = next(records, None)
+            if record is None:
+                return
+            pending.append((record, submit_in_context(executor, get_call_record_details, token, record.get("id", ""))))
+    
+    try:
+        fill()
+        while pending:
+            record, future = pending.popleft()
+            details = future.result()
+            fill()
+            yield record, details
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 def extract_participant_info(endpoint, role, seg_start, seg_end):
     """Extract participant information from caller/callee endpoint"""
     identity = endpoint.get("identity", {})
@@ -580,48 +1948,137 @@ def extract_all_participants(call_record):
         'participants': participants
     }
 
-def get_user_details(token, user_id):
-    """Get user details like email"""
-    if not user_id or user_id.startswith(('phone_', 'guest_', 'app_')) or user_id == 'unknown_user':
-        return None
+# Graph user ID -> {mail, userPrincipalName, displayName}, or None for users that 404
+user_details_cache = LRUCache(USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+def is_graph_user_id(user_id):
+    return bool(user_id) and not user_id.startswith(('phone_', 'guest_', 'app_')) and user_id != 'unknown_user'
+
+# resolve_users value for a Graph user that couldn't be looked up, as opposed to None for one that doesn't exist
+UNRESOLVED = object()
+
+def batch_retry_after(item, attempt):
+    """Seconds to wait before retrying a throttled $batch sub-request"""
+    headers = {name.lower(): value for name, value in (item.get("headers") or {}).items()}
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        return 0.5 * 2 ** attempt
+
+@traced("teams.resolve_users")
+def resolve_users(token, user_ids):
+    """Resolve Graph user IDs to user details, fetching cache misses through $batch.
+
+    Throttled sub-requests are retried after their Retry-After, up to
+    HTTP_MAX_RETRIES times; users that still couldn't be fetched map to
+    UNRESOLVED.
+    """
+    results = {}
+    misses = []
+    for user_id in dict.fromkeys(user_ids):
+        if not is_graph_user_id(user_id):
+            results[user_id] = None
+            continue
+        cached = user_details_cache.get(user_id, MISSING)
+        if cached is MISSING:
+            misses.append(user_id)
+        else:
+            results[user_id] = cached
     
     headers = {"Authorization": f"Bearer {token}"}
-    url = f"https://graph.microsoft.com/v1.0/users/{user_id}"
-    
-    try:
-        resp = requests.get(url, headers=headers)
-        if resp.status_code == 200:
-            return resp.json()
-    except:
-        pass
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        throttled, retry_after = [], 0.0
+        for i in range(0, len(misses), GRAPH_BATCH_SIZE):
+            chunk = misses[i:i + GRAPH_BATCH_SIZE]
+            batch = {"requests": [
+                {"id": str(n), "method": "GET", "url": f"/users/{user_id}?$select=mail,userPrincipalName,displayName"}
+                for n, user_id in enumerate(chunk)
+            ]}
+            try:
+                resp = http_session.post(f"{GRAPH_V1}/$batch", headers=headers, json=batch, timeout=upstream_timeout())
+                if resp.status_code != 200:
+                    logger.error(f"[TEAMS] User batch error: {resp.status_code} - {resp.text}")
+                    continue
+                for item in resp.json().get("responses", []):
+                    user_id = chunk[int(item["id"])]
+                    status = item.get("status")
+                    if status == 200:
+                        body = item.get("body", {})
+                        details = {
+                            "mail": body.get("mail"),
+                            "userPrincipalName": body.get("userPrincipalName"),
+                            "displayName": body.get("displayName")
+                        }
+                        user_details_cache.set(user_id, details)
+                        results[user_id] = details
+                    elif status == 404:
+                        user_details_cache.set(user_id, None, ttl=USER_NEGATIVE_CACHE_TTL)
+                        results[user_id] = None
+                    elif status in (429, 503):
+                        if status == 429:
+                            upstream_throttled.labels("graph_users_batch").inc()
+                        throttled.append(user_id)
+                        retry_after = max(retry_after, batch_retry_after(item, attempt))
+            except Exception as e:
+                logger.error(f"[TEAMS] User batch exception: {e}")
+        
+        misses = throttled
+        if not misses or attempt == HTTP_MAX_RETRIES:
+            break
+        try:
+            wait = min(retry_after, upstream_timeout(HTTP_RETRY_AFTER_MAX))
+        except DeadlineExceeded:
+            break
+        logger.warning(f"[TEAMS] {len(misses)} user lookup(s) throttled, retrying in {wait:.1f}s")
+        time.sleep(wait)
     
-    return None
+    unresolved = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in results]
+    if unresolved:
+        logger.warning(f"[TEAMS] Could not resolve {len(unresolved)} user(s)")
+    return {user_id: results.get(user_id, UNRESOLVED) for user_id in dict.fromkeys(user_ids)}
+
+def get_user_details(token, user_id):
+    """Get user details like email"""
+    details = resolve_users(token, [user_id]).get(user_id)
+    return None if details is UNRESOLVED else details
+
+def graph_user_participants(participants):
+    """IDs of participants that can be resolved as Graph users"""
+    return [pid for pid, info in participants.items()
+            if info['type'] == 'user' and not pid.startswith(('phone_', 'guest_', 'app_', 'unknown'))]
 
 def check_organizer_in_meeting(participants, organizer_email, token):
     """Check if organizer email is found in any participant's email"""
     if not organizer_email:
         return True, None
     
-    target_email = organizer_email.lower().strip()
+    # Compared by primary address, so an alias on the invite matches the Graph mail or UPN
+    target_email = internal_identities.canonical(organizer_email)
+    users = resolve_users(token, graph_user_participants(participants))
     
-    for pid, info in participants.items():
-        if info['type'] == 'user' and not pid.startswith(('phone_', 'guest_', 'app_', 'unknown')):
-            user_details = get_user_details(token, pid)
-            if user_details:
-                email = user_details.get("mail", "").lower()
-                upn = user_details.get("userPrincipalName", "").lower()
-                
-                if email and target_email == email:
-                    return True, user_details.get("displayName", info['displayName'])
-                if upn and target_email == upn:
-                    return True, user_details.get("displayName", info['displayName'])
+    for pid, user_details in users.items():
+        if user_details and user_details is not UNRESOLVED:
+            info = participants[pid]
+            email = internal_identities.canonical(user_details.get("mail") or "")
+            upn = internal_identities.canonical(user_details.get("userPrincipalName") or "")
+            
+            if email and target_email == email:
+                return True, user_details.get("displayName") or info['displayName']
+            if upn and target_email == upn:
+                return True, user_details.get("displayName") or info['displayName']
     
     return False, None
 
 def check_external_participants(participants, token):
-    """Check if any external participants attended the meeting"""
+    """Check if any external participants attended the meeting.
+
+    Returns (has_external, external_participants, unresolved), where
+    unresolved names the user participants whose Graph lookup failed.
+    """
     external_count = 0
     external_participants = []
+    unresolved = []
+    users = resolve_users(token, graph_user_participants(participants))
     
     for pid, info in participants.items():
         display_name = info.get('displayName', '')
@@ -633,15 +2090,19 @@ def check_external_participants(participants, token):
             continue
             
         if info['type'] == 'user' and not pid.startswith(('phone_', 'guest_', 'app_', 'unknown')):
-            user_details = get_user_details(token, pid)
-            if user_details:
-                email = user_details.get("mail") or user_details.get("userPrincipalName", "")
+            user_details = users.get(pid)
+            if user_details is UNRESOLVED:
+                # Lookup failed: could be internal or external
+                unresolved.append(display_name)
+                logger.info(f"[TEAMS] Could not look up participant: {display_name}")
+            elif user_details:
+                email = user_details.get("mail") or user_details.get("userPrincipalName") or ""
                 if email:
-                    if email.lower() not in [e.lower() for e in INTERNAL_EMAILS]:
+                    if not is_internal_email(email):
                         external_count += 1
                         external_participants.append({
                             'email': email,
-                            'displayName': user_details.get("displayName", display_name),
+                            'displayName': user_details.get("displayName") or display_name,
                             'type': 'external_user'
                         })
                         logger.info(f"[TEAMS] Found external participant with email: {email}")
@@ -671,9 +2132,94 @@ def check_external_participants(participants, token):
             logger.info(f"[TEAMS] Found external {info['type']} participant: {display_name}")
     
     logger.info(f"[TEAMS] Total external participants found: {external_count}")
-    return external_count > 0, external_participants
+    return external_count > 0, external_participants, unresolved
+
+def match_teams_event(event, start_time, end_time, invitee_email):
+    """Return the Teams meeting details for a calendar event, or None if it doesn't match"""
+    event_start_str = event.get('start', {}).get('dateTime', '')
+    event_end_str = event.get('end', {}).get('dateTime', '')
+    if not event_start_str or not event_end_str:
+        return None
+    
+    event_start = parse_dt(event_start_str)
+    event_end = parse_dt(event_end_str)
+    
+    # Must overlap the search window, as events().list would enforce
+    if event_end <= start_time or event_start >= end_time:
+        return None
+    
+    if (abs(event_start - start_time) > TEAMS_TIME_TOLERANCE or 
+        abs(event_end - end_time) > TEAMS_TIME_TOLERANCE):
+        return None
+    
+    attendees_raw = event.get('attendees', [])
+    attendees = [a.get('email', '').lower() for a in attendees_raw if 'email' in a]
+    
+    if invitee_email not in attendees:
+        return None
+    
+    teams_link = detect_teams_meeting(event)
+    if not teams_link:
+        return None
+    
+    return {
+        "start_time": event_start_str,
+        "end_time": event_end_str,
+        "attendees": attendees,
+        "meeting_title": event.get('summary', 'No Title'),
+        "teams_link": teams_link,
+        "teams_meeting_id": None
+    }
+
+@traced("teams.find_meetings")
+def find_teams_meetings(start_time, end_time, invitee_email, calendar_events=None):
+    """Find the unique Teams meetings with the invitee across internal calendars"""
+    google_meetings = []
+    seen_meetings = set()
+    resolved_ids = {}
+    
+    def match_event(email, event):
+        meeting = match_teams_event(event, start_time, end_time, invitee_email)
+        if meeting:
+            teams_link = meeting["teams_link"]
+            if teams_link not in resolved_ids:
+                resolved_ids[teams_link] = extract_teams_meeting_id_enhanced(teams_link)
+            meeting["teams_meeting_id"] = resolved_ids[teams_link]
+        return meeting
+    
+    live_calendars = None
+    if calendar_events is None:
+        indexed = lookup_indexed_events(start_time, end_time, invitee_email)
+        if indexed is not None:
+            calendar_events, live_calendars = indexed
+    
+    matches = []
+    for email, event in calendar_events or []:
+        meeting = match_event(email, event)
+        if meeting:
+            matches.append((email, meeting))
+    
+    # Calendars the index doesn't cover (all of them without an index) are listed live
+    if calendar_events is None or live_calendars:
+        matches += scan_internal_calendars(start_time, end_time, match_event, log_prefix="[TEAMS]",
+                                           invitee=invitee_email, calendars=live_calendars)
+    
+    for email, meeting in matches:
+        teams_link = meeting["teams_link"]
+        teams_id = meeting["teams_meeting_id"]
+        meeting_key = f"{teams_link}_{teams_id}" if teams_id else teams_link
+        
+        if meeting_key in seen_meetings:
+            continue
+        
+        seen_meetings.add(meeting_key)
+        google_meetings.append(meeting)
+        record_calendar_hit(email, invitee_email)
+    
+    return google_meetings
 
-def check_teams_meeting(start_time_str, end_time_str, invitee):
+@traced("teams")
+def check_teams_meeting(start_time_str, end_time_str, invitee, calendar_events=None, batch_window=None):
     """Check Microsoft Teams meetings - uses both start_time and end_time"""
     try:
         start_time = validate_datetime_input(start_time_str)
@@ -683,68 +2229,7 @@ def check_teams_meeting(start_time_str, end_time_str, invitee):
         logger.info(f"[TEAMS] Searching for Teams meetings between {start_time} and {end_time} with invitee {invitee_email}")
         
         # Step 1: Find Teams meetings in Google Calendar
-        google_meetings = []
-        seen_meetings = set()
-        
-        for email in INTERNAL_EMAILS:
-            try:
-                creds = get_calendar_credentials(email)
-                cal_service = build('calendar', 'v3', credentials=creds)
-                
-                events_result = cal_service.events().list(
-                    calendarId=email,
-                    timeMin=start_time.isoformat(),
-                    timeMax=end_time.isoformat(),
-                    singleEvents=True
-                ).execute()
-                
-                events = events_result.get('items', [])
-                
-                for event in events:
-                    event_start_str = event.get('start', {}).get('dateTime', '')
-                    event_end_str = event.get('end', {}).get('dateTime', '')
-                    if not event_start_str or not event_end_str:
-                        continue
-                    
-                    event_start = parse_dt(event_start_str)
-                    event_end = parse_dt(event_end_str)
-                    
-                    time_tolerance = timedelta(minutes=15)
-                    if (abs(event_start - start_time) > time_tolerance or 
-                        abs(event_end - end_time) > time_tolerance):
-                        continue
-                    
-                    attendees_raw = event.get('attendees', [])
-                    attendees = [a.get('email', '').lower() for a in attendees_raw if 'email' in a]
-                    
-                    if invitee_email not in attendees:
-                        continue
-                    
-                    teams_link = detect_teams_meeting(event)
-                    if not teams_link:
-                        continue
-                    
-                    teams_id = extract_teams_meeting_id_enhanced(teams_link)
-                    
-                    meeting_key = f"{teams_link}_{teams_id}" if teams_id else teams_link
-                    
-                    if meeting_key in seen_meetings:
-                        continue
-                    
-                    seen_meetings.add(meeting_key)
-                    
-                    google_meetings.append({
-                        "start_time": event_start_str,
-                        "end_time": event_end_str,
-                        "attendees": attendees,
-                        "meeting_title": event.get('summary', 'No Title'),
-                        "teams_link": teams_link,
-                        "teams_meeting_id": teams_id
-                    })
-                    
-            except Exception as e:
-                logger.warning(f"[TEAMS] Skipping {email}: {str(e)}")
-                continue
+        google_meetings = find_teams_meetings(start_time, end_time, invitee_email, calendar_events)
         
         logger.info(f"[TEAMS] Found {len(google_meetings)} unique Teams meetings")
         
@@ -778,9 +2263,13 @@ def check_teams_meeting(start_time_str, end_time_str, invitee):
             elif not end_iso.endswith('Z') and 'T' in end_iso and '+' not in end_iso and '-' not in end_iso.split('T')[1]:
                 end_iso += 'Z'
             
-            call_records = find_meetings_in_timerange(token, start_iso, end_iso)
+            if batch_window:
+                call_records = iter(batch_window.call_records(token, start_iso, end_iso))
+            else:
+                call_records = find_meetings_in_timerange(token, start_iso, end_iso)
+            first_record = next(call_records, None)
             
-            if not call_records:
+            if first_record is None:
                 return {
                     "platform": "Microsoft Teams",
                     "meeting_found": False,
@@ -792,30 +2281,30 @@ def check_teams_meeting(start_time_str, end_time_str, invitee):
                     "message": "Meeting found in calendar but no call records found"
                 }
             
-            # Check each call record
-            for record in call_records:
-                record_id = record.get("id", "")
-                detailed_record = get_call_record_details(token, record_id)
-                
+            # Check each call record, stopping at the first one with an internal attendee
+            call_records = itertools.chain([first_record], call_records)
+            for record, detailed_record in iter_call_record_details(token, call_records):
                 if detailed_record:
                     meeting_data = extract_all_participants(detailed_record)
                     participants = meeting_data['participants']
                     
-                    # Check if any @giga.green attendee is in this meeting
-                    giga_green_attendees = [email for email in meeting["attendees"] if email.endswith('@giga.green')]
+                    # Check if any internal attendee is in this meeting
+                    internal_attendees = [email for email in meeting["attendees"] if is_internal_email(email)]
                     
-                    giga_found = False
-                    for giga_email in giga_green_attendees:
-                        found, organizer_name = check_organizer_in_meeting(participants, giga_email, token)
+                    internal_found = False
+                    for internal_email in internal_attendees:
+                        found, organizer_name = check_organizer_in_meeting(participants, internal_email, token)
                         if found:
-                            giga_found = True
+                            internal_found = True
                             break
                     
-                    if giga_found:
+                    if internal_found:
                         # Check for external participants
-                        has_external, external_participants = check_external_participants(participants, token)
+                        has_external, external_participants, unresolved = check_external_participants(
+                            participants, token
+                        )
                         
-                        return {
+                        result = {
                             "platform": "Microsoft Teams",
                             "meeting_found": True,
                             "meeting_link": meeting["teams_link"],
@@ -825,6 +2314,13 @@ def check_teams_meeting(start_time_str, end_time_str, invitee):
                             "external_participants": [p['email'] or p['displayName'] for p in external_participants],
                             "external_participants_details": external_participants
                         }
+                        if unresolved:
+                            # Any of them may be the external attendee, so no external found isn't a no-show
+                            result["unresolved_participants"] = unresolved
+                            if not has_external:
+                                result["no_show"] = "no data"
+                                result["message"] = "Some participants could not be looked up"
+                        return result
             
             # If we get here, no matching call record was found
             return {
@@ -861,20 +2357,379 @@ def check_teams_meeting(start_time_str, end_time_str, invitee):
             "error": str(e)
         }
 
-# ===================== UNIFIED ENDPOINT =====================
+# ===================== INTERNAL IDENTITIES =====================
 
-@app.route('/check_meeting_unified', methods=['POST'])
-def check_meeting_unified():
-    """Unified endpoint to check both Google Meet and Teams meetings"""
-    data = request.get_json()
+class InternalIdentities:
+    """Immutable snapshot of who counts as internal: known addresses, their aliases and internal domains"""
+    
+    def __init__(self, emails, aliases, domains):
+        self.emails = frozenset(email.lower() for email in emails)
+        self.aliases = {alias.lower(): email.lower() for alias, email in aliases.items()}
+        self.domains = frozenset(domain.lower() for domain in domains)
     
+    def canonical(self, email):
+        """Primary address for an alias or UPN, or the address itself"""
+        email = email.strip().lower()
+        return self.aliases.get(email, email)
+    
+    def is_internal(self, email):
+        email = email.strip().lower()
+        return email in self.emails or email in self.aliases or email.rpartition("@")[2] in self.domains
+
+_identity_lock = threading.Lock()
+_directory_service = None
+_directory_users = {}  # source -> (emails, aliases) from its last successful load
+_identities_file_config = {}  # INTERNAL_IDENTITIES_FILE contents from its last successful load
+identity_stats = {"loaded_at": None, "sources": {}}
+
+def get_directory_service():
+    """Get the shared Admin Directory resource, built once from the bundled discovery document"""
+    global _directory_service
+    with _identity_lock:
+        if _directory_service is None:
+            _directory_service = build('admin', 'directory_v1', http=httplib2.Http(),
+                                       static_discovery=True, cache_discovery=False)
+        return _directory_service
+
+def fetch_google_directory_users():
+    """(emails, aliases) for every user in the Google Workspace directory"""
+    creds = get_service_account_credentials().with_scopes([DIRECTORY_SCOPE]).with_subject(DELEGATED_ADMIN_EMAIL)
+    http = GoogleApiHttp(creds)
+    emails, aliases = set(), {}
+    page_token = None
+    while True:
+        response = get_directory_service().users().list(
+            customer='my_customer',
+            maxResults=DIRECTORY_PAGE_SIZE,
+            pageToken=page_token,
+            fields='nextPageToken,users(primaryEmail,aliases,nonEditableAliases)'
+        ).execute(http=http)
+        for user in response.get('users', []):
+            primary = user['primaryEmail'].lower()
+            emails.add(primary)
+            for alias in user.get('aliases', []) + user.get('nonEditableAliases', []):
+                aliases[alias.lower()] = primary
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return emails, aliases
+
+def fetch_graph_users():
+    """(emails, aliases) for every member account in the Microsoft 365 tenant; guests are skipped"""
+    headers = {"Authorization": f"Bearer {get_app_token()}"}
+    url = f"{GRAPH_V1}/users?$select=mail,userPrincipalName,proxyAddresses,userType&$top={GRAPH_USERS_PAGE_SIZE}"
+    emails, aliases = set(), {}
+    while url:
+        resp = http_session.get(url, headers=headers, timeout=upstream_timeout())
+        resp.raise_for_status()
+        data = resp.json()
+        for user in data.get("value", []):
+            primary = (user.get("mail") or user.get("userPrincipalName") or "").lower()
+            if not primary or user.get("userType") == "Guest":
+                continue
+            emails.add(primary)
+            addresses = [user.get("userPrincipalName") or ""]
+            addresses += [a.split(":", 1)[1] for a in user.get("proxyAddresses") or [] if a.lower().startswith("smtp:")]
+            for address in addresses:
+                if address and address.lower() != primary:
+                    aliases[address.lower()] = primary
+        url = data.get("@odata.nextLink")
+    return emails, aliases
+
+DIRECTORY_SOURCES = {"google": fetch_google_directory_users, "graph": fetch_graph_users}
+
+def validate_identities_config(config):
+    """Raise ValueError unless config has the INTERNAL_IDENTITIES_FILE shape"""
+    def is_string_list(value):
+        return isinstance(value, list) and all(isinstance(item, str) for item in value)
+    if not isinstance(config, dict):
+        raise ValueError("expected a JSON object")
+    for key in ("emails", "domains"):
+        if not is_string_list(config.get(key, [])):
+            raise ValueError(f"{key} must be a list of strings")
+    aliases = config.get("aliases", {})
+    if not isinstance(aliases, dict) or not all(isinstance(value, str) for value in aliases.values()):
+        raise ValueError("aliases must map alias strings to address strings")
+
+def load_configured_identities():
+    """(emails, aliases, domains) from INTERNAL_EMAILS, ORG_DOMAIN, INTERNAL_DOMAINS and INTERNAL_IDENTITIES_FILE.
+
+    A missing or malformed file is logged and its last successful load used
+    instead, so it never takes the worker down.
+    """
+    global _identities_file_config
+    emails = set(INTERNAL_EMAILS)
+    aliases = {}
+    domains = {ORG_DOMAIN, *INTERNAL_DOMAINS}
+    if INTERNAL_IDENTITIES_FILE:
+        try:
+            with open(INTERNAL_IDENTITIES_FILE) as f:
+                config = json.load(f)
+            validate_identities_config(config)
+            _identities_file_config = config
+            identity_stats["sources"]["file"] = {"loaded_at": time.time()}
+        except Exception as e:
+            logger.warning(f"[IDENTITY] Loading {INTERNAL_IDENTITIES_FILE} failed, keeping the previous list: {e}")
+            identity_stats["sources"].setdefault("file", {})["error"] = str(e)
+        emails.update(_identities_file_config.get("emails", []))
+        aliases.update(_identities_file_config.get("aliases", {}))
+        domains.update(_identities_file_config.get("domains", []))
+    return emails, aliases, domains
+
+def reload_internal_identities(sources=None):
+    """Rebuild the internal identity snapshot from config and the directory sources.
+
+    A source that fails keeps contributing the users from its last successful
+    load, so a directory outage never turns employees into external attendees.
+    """
+    global internal_identities
+    sources = IDENTITY_SOURCES if sources is None else sources
+    with _identity_lock:
+        emails, aliases, domains = load_configured_identities()
+    for source in sources:
+        try:
+            source_emails, source_aliases = DIRECTORY_SOURCES[source]()
+        except Exception as e:
+            logger.warning(f"[IDENTITY] Loading {source} users failed, keeping the previous list: {e}")
+            identity_stats["sources"].setdefault(source, {})["error"] = str(e)
+            continue
+        with _identity_lock:
+            _directory_users[source] = (source_emails, source_aliases)
+        identity_stats["sources"][source] = {"users": len(source_emails), "aliases": len(source_aliases),
+                                             "loaded_at": time.time()}
+        logger.info(f"[IDENTITY] Loaded {len(source_emails)} {source} user(s)")
+    with _identity_lock:
+        for source_emails, source_aliases in _directory_users.values():
+            emails |= source_emails
+            aliases.update(source_aliases)
+        # Replaced in one assignment, so readers always see a complete snapshot
+        internal_identities = InternalIdentities(emails, aliases, domains)
+        identity_stats["loaded_at"] = time.time()
+    return internal_identities
+
+def is_internal_email(email):
+    return internal_identities.is_internal(email)
+
+def internal_identity_stats():
+    identities = internal_identities
+    return {
+        "emails": len(identities.emails),
+        "aliases": len(identities.aliases),
+        "domains": sorted(identities.domains),
+        **identity_stats
+    }
+
+internal_identities = reload_internal_identities(sources=())
+
+@app.route('/internal_identities/reload', methods=['POST'])
+def reload_identities():
+    """Reload internal users from config and the directory sources without a restart"""
+    reload_internal_identities()
+    return jsonify(internal_identity_stats())
+
+# ===================== STARTUP =====================
+
+# Seconds since IMPORT_STARTED_AT at each milestone, for /stats and the startup gauge
+startup_stats = {"import_seconds": None, "first_response_seconds": None, "first_response_path": None}
+_startup_lock = threading.Lock()
+_workers_started = False
+prewarm_state = {"status": "not_started", "seconds": None, "steps": {}}
+
+def record_startup_milestone(milestone):
+    seconds = time.perf_counter() - IMPORT_STARTED_AT
+    startup_duration.labels(milestone).set(seconds)
+    return round(seconds, 3)
+
+def start_background_workers():
+    """Start the token refresher and the sync, ingestion and identity reload workers once per process.
+
+    Deferred to the first request, so importing the app does no network work
+    and a transient upstream failure can't keep the worker from booting.
+    """
+    global _workers_started
+    if _workers_started:
+        return
+    with _startup_lock:
+        if _workers_started:
+            return
+        _workers_started = True
+    if not missing_vars:
+        # Fetch the first token in the background so requests don't wait on AAD
+        start_token_refresher()
+    if CALENDAR_SYNC_INTERVAL > 0:
+        start_background_worker("calendar-sync", CALENDAR_SYNC_INTERVAL, sync_calendars)
+    if MEET_INGEST_INTERVAL > 0:
+        start_background_worker("meet-ingester", MEET_INGEST_INTERVAL, ingest_meet_activities)
+    if IDENTITY_SOURCES and IDENTITY_RELOAD_INTERVAL > 0:
+        start_background_worker("identity-reload", IDENTITY_RELOAD_INTERVAL, reload_internal_identities)
+
+def prewarm_calendar_credentials():
+    for email in calendar_probe_order()[:max(CALENDAR_PRIORITY_PROBES, 1)]:
+        get_calendar_credentials(email)
+
+def prewarm_graph_token():
+    if missing_vars:
+        return "skipped"
+    get_app_token()
+
+PREWARM_STEPS = [
+    ("reports_client", get_reports_service),
+    ("calendar_client", get_calendar_service),
+    ("reports_token", lambda: get_reports_credentials().refresh(google_auth_request())),
+    ("calendar_tokens", prewarm_calendar_credentials),
+    ("graph_token", prewarm_graph_token),
+]
+
+def prewarm():
+    """Build the API clients and fetch tokens ahead of the first check.
+
+    A step that fails is only logged; the same work happens again lazily
+    when a check first needs it.
+    """
+    started_at = time.perf_counter()
+    for name, step in PREWARM_STEPS:
+        step_started_at = time.perf_counter()
+        try:
+            skipped = step() == "skipped"
+            prewarm_state["steps"][name] = {"status": "skipped" if skipped else "ok"}
+        except Exception as e:
+            logger.warning(f"[STARTUP] Pre-warming {name} failed: {e}")
+            prewarm_state["steps"][name] = {"status": "failed", "error": str(e)}
+        prewarm_state["steps"][name]["seconds"] = round(time.perf_counter() - step_started_at, 3)
+    prewarm_state["seconds"] = round(time.perf_counter() - started_at, 3)
+    prewarm_state["status"] = "done"
+    record_startup_milestone("prewarm")
+    logger.info(f"[STARTUP] Pre-warm finished in {prewarm_state['seconds']}s")
+
+def start_prewarm():
+    with _startup_lock:
+        if prewarm_state["status"] != "not_started":
+            return
+        prewarm_state["status"] = "running"
+    threading.Thread(target=prewarm, name="prewarm", daemon=True).start()
+
+def startup_view():
+    return {**startup_stats, "workers_started": _workers_started,
+            "prewarm": {**prewarm_state, "steps": dict(prewarm_state["steps"])}}
+
+@app.before_request
+def ensure_started():
+    start_background_workers()
+
+@app.after_request
+def record_first_response(response):
+    if startup_stats["first_response_seconds"] is None:
+        with _startup_lock:
+            if startup_stats["first_response_seconds"] is None:
+                startup_stats["first_response_path"] = request.path
+                startup_stats["first_response_seconds"] = record_startup_milestone("first_response")
+                logger.info(f"[STARTUP] First response ({request.path}) "
+                            f"{startup_stats['first_response_seconds']}s after import started")
+    return response
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe. With READY_PREWARM (or ?prewarm=1) it starts warming
+    clients and tokens in the background and answers 503 until that is done."""
+    if READY_PREWARM or request.args.get("prewarm") in ("1", "true"):
+        start_prewarm()
+    is_ready = prewarm_state["status"] != "running"
+    return jsonify({"ready": is_ready, "startup": startup_view()}), 200 if is_ready else 503
+
+# ===================== UNIFIED ENDPOINT =====================
+
+def unified_calendar_window(start_time_dt, end_time_dt=None):
+    """Union of the Google Meet (start +/- buffer) and Teams (start..end) calendar windows"""
+    time_min = start_time_dt - GOOGLE_MEET_TIME_BUFFER
+    time_max = start_time_dt + timedelta(hours=1) + GOOGLE_MEET_TIME_BUFFER
+    if end_time_dt:
+        time_max = max(time_max, end_time_dt)
+    return time_min, time_max
+
+# Unified responses keyed on normalized (start_time, end_time, invitee)
+result_cache = LRUCache(RESULT_CACHE_SIZE)
+
+def result_cache_key(start_time_dt, end_time_dt, invitee):
+    def normalize(dt):
+        return dt.astimezone(pytz.utc).isoformat() if dt and dt.tzinfo else (dt.isoformat() if dt else None)
+    return normalize(start_time_dt), normalize(end_time_dt), invitee
+
+def result_cache_ttl(response, start_time_dt, end_time_dt):
+    """How long a unified response may be reused, or None if it shouldn't be cached.
+
+    true/false for meetings that ended more than RESULT_FINALITY_DELAY ago won't
+    change any more, provided every participant was resolved; everything else
+    may still as calendars, audit logs and user lookups catch up.
+    """
+    if response["no_show"] == "incorrect data":
+        return None
+    meeting_end = end_time_dt or start_time_dt + timedelta(hours=1)
+    if meeting_end.tzinfo is None:
+        meeting_end = meeting_end.replace(tzinfo=pytz.utc)
+    settled = time.time() - meeting_end.timestamp() > RESULT_FINALITY_DELAY
+    if response["no_show"] in (True, False) and settled and not response.get("unresolved_participants"):
+        return RESULT_CACHE_FINAL_TTL
+    return RESULT_CACHE_SHORT_TTL
+
+def wait_for_platform_check(future, platform, deadline):
+    """Wait for a platform check until the request deadline; a check still running counts as not found"""
+    try:
+        return future.result(timeout=deadline.remaining())
+    except TimeoutError:
+        logger.warning(f"{platform} check did not finish within the request time budget")
+        deadline.exceeded = True
+        return {
+            "platform": platform,
+            "meeting_found": False,
+            "meeting_link": None,
+            "no_show": "NA",
+            "external_participants": [],
+            "error": "Check timed out"
+        }
+
+def run_unified_check(start_time, end_time, invitee, batch_window=None, refresh=False, time_budget=None,
+                      organizer=None, debug_timing=False):
+    """Check both Google Meet and Teams for one meeting; returns (response, status_code).
+
+    Every upstream call shares a deadline of time_budget seconds (default
+    UNIFIED_CHECK_TIMEOUT). When it runs out the best answer so far is returned
+    with "partial": true. organizer optionally names the internal calendar
+    most likely to hold the meeting, which is then probed first. With
+    debug_timing the response includes a nested span timing breakdown.
+    """
+    deadline = Deadline(request_time_budget(time_budget))
+    call_counter = CallCounter()
+    trace = Trace() if debug_timing or TRACE_EXPORT_PATH else None
+    started_at = time.monotonic()
+    deadline_token = current_deadline.set(deadline)
+    counter_token = current_call_counter.set(call_counter)
+    trace_token = current_trace.set(trace)
+    try:
+        with span("unified_check"):
+            response, status = unified_check(start_time, end_time, invitee, batch_window, refresh, deadline,
+                                             organizer)
+    finally:
+        current_trace.reset(trace_token)
+        current_call_counter.reset(counter_token)
+        current_deadline.reset(deadline_token)
+    check_latency.labels(no_show_outcome(response)).observe(time.monotonic() - started_at)
+    check_upstream_calls.observe(call_counter.calls)
+    if trace:
+        if TRACE_EXPORT_PATH:
+            try:
+                export_trace(trace)
+            except OSError as e:
+                logger.warning(f"Could not export trace: {e}")
+        if debug_timing:
+            response["timing"] = trace.tree()
+    return response, status
+
+def unified_check(start_time, end_time, invitee, batch_window, refresh, deadline, organizer=None):
+    """Run one unified check under deadline; results are served from result_cache unless refresh is set"""
     # Validate required inputs
-    start_time = data.get("start_time")
-    invitee = data.get("invitee", "").lower() if data.get("invitee") else None
-    end_time = data.get("end_time")
+    invitee = invitee.lower() if invitee else None
     
     if not start_time or not invitee:
-        return jsonify({"error": "Missing start_time or invitee"}), 400
+        return {"error": "Missing start_time or invitee"}, 400
     
     # Initialize response
     response = {
@@ -901,24 +2756,69 @@ def check_meeting_unified():
         logger.error(f"Invalid datetime format: {str(e)}")
         response["no_show"] = "incorrect data"
         response["error"] = f"Invalid datetime format: {str(e)}"
-        return jsonify(response)
+        return response, 200
+    
+    start_time_dt = parser.isoparse(start_time)
+    end_time_dt = parser.isoparse(end_time) if end_time else None
+    cache_key = result_cache_key(start_time_dt, end_time_dt, invitee)
+    if not refresh:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Serving cached result for {invitee} at {start_time}")
+            cached = copy.deepcopy(cached)
+            cached["search_criteria"] = response["search_criteria"]
+            cached["cached"] = True
+            return cached, 200
     
     try:
-        # Check Google Meet (uses only start_time internally)
+        # Sweep the calendars once over the union of the Google Meet and Teams windows
         logger.info("=" * 50)
-        logger.info("Checking Google Meet...")
-        google_meet_result = check_google_meet(start_time, invitee)
-        
-        # Check Microsoft Teams only if end_time is provided
-        teams_result = None
-        teams_error = None
-        if end_time:
-            logger.info("=" * 50)
-            logger.info("Checking Microsoft Teams...")
-            teams_result = check_teams_meeting(start_time, end_time, invitee)
+        logger.info("Fetching calendar events...")
+        if batch_window:
+            calendar_events = batch_window.calendar_events(invitee)
         else:
-            teams_error = "end_time not provided - Teams check skipped"
-            logger.info(f"[TEAMS] {teams_error}")
+            time_min, time_max = unified_calendar_window(start_time_dt, end_time_dt)
+            
+            def conclusive(event):
+                """An event that settles the answer, so other calendars needn't be listed.
+
+                With end_time a Teams meeting found anywhere overrides Google Meet,
+                so only an event the Teams matcher accepts ends the sweep early.
+                """
+                try:
+                    if end_time_dt:
+                        return match_teams_event(event, start_time_dt, end_time_dt, invitee) is not None
+                    return bool(match_google_meet_event(event, start_time_dt, start_time_dt + timedelta(hours=1),
+                                                        invitee))
+                except (TypeError, ValueError):
+                    return False
+            
+            calendar_events = fetch_candidate_events(time_min, time_max, invitee, organizer, conclusive)
+        logger.info(f"Found {len(calendar_events)} candidate calendar event(s) with {invitee}")
+        
+        # Run both platform checks concurrently under the request deadline
+        # (Google Meet uses only start_time; Teams only runs if end_time is provided)
+        logger.info("=" * 50)
+        logger.info("Checking Google Meet and Microsoft Teams...")
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="platform-check")
+        try:
+            google_future = submit_in_context(
+                executor, check_google_meet, start_time, invitee, calendar_events, batch_window
+            )
+            teams_future = None
+            teams_error = None
+            if end_time:
+                teams_future = submit_in_context(
+                    executor, check_teams_meeting, start_time, end_time, invitee, calendar_events, batch_window
+                )
+            else:
+                teams_error = "end_time not provided - Teams check skipped"
+                logger.info(f"[TEAMS] {teams_error}")
+            
+            google_meet_result = wait_for_platform_check(google_future, "Google Meet", deadline)
+            teams_result = wait_for_platform_check(teams_future, "Microsoft Teams", deadline) if teams_future else None
+        finally:
+            executor.shutdown(wait=False)
         
         # Determine unified no_show status and meeting link
         unified_no_show = "NA"
@@ -938,6 +2838,8 @@ def check_meeting_unified():
             unified_no_show = teams_result.get("no_show")
             meeting_link = teams_result.get("meeting_link")
             external_participants = teams_result.get("external_participants", [])
+            if teams_result.get("unresolved_participants"):
+                response["unresolved_participants"] = teams_result["unresolved_participants"]
             # Determine platform based on URL
             if meeting_link and "calendly" in meeting_link.lower():
                 platform = "Microsoft Teams (Calendly)"
@@ -954,24 +2856,480 @@ def check_meeting_unified():
         if teams_error and not google_meet_result.get("meeting_found"):
             response["error"] = teams_error
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Meeting check ran out of time: {str(e)}")
+        response["error"] = str(e)
     except Exception as e:
         logger.error(f"Unexpected error during meeting check: {str(e)}")
         response["no_show"] = "incorrect data"
         response["error"] = f"Processing error: {str(e)}"
     
-    return jsonify(response)
+    # Partial results are never cached
+    if deadline.partial:
+        response["partial"] = True
+        return response, 200
+    
+    ttl = result_cache_ttl(response, start_time_dt, end_time_dt)
+    if ttl:
+        result_cache.set(cache_key, copy.deepcopy(response), ttl=ttl)
+    
+    return response, 200
+
+def debug_timing_requested():
+    return request.headers.get(DEBUG_TIMING_HEADER, "").lower() in ("1", "true", "yes")
+
+@app.route('/check_meeting_unified', methods=['POST'])
+def check_meeting_unified():
+    """Unified endpoint to check both Google Meet and Teams meetings"""
+    data = request.get_json()
+    refresh = bool(data.get("refresh")) or "no-cache" in request.headers.get("Cache-Control", "")
+    
+    if data.get("async") or request.args.get("async") in ("1", "true"):
+        if not data.get("start_time") or not data.get("invitee"):
+            return jsonify({"error": "Missing start_time or invitee"}), 400
+        callback_error = validate_callback_url(data.get("callback_url"))
+        if callback_error:
+            return jsonify({"error": callback_error}), 400
+        job = submit_job(data.get("start_time"), data.get("end_time"), data.get("invitee"),
+                         data.get("callback_url"), refresh, data.get("timeout_seconds"), data.get("organizer"))
+        if job is None:
+            return jsonify({"error": "Job queue is full, retry later"}), 503
+        return jsonify({
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['job_id']}"
+        }), 202
+    
+    response, status = run_unified_check(data.get("start_time"), data.get("end_time"), data.get("invitee"),
+                                         refresh=refresh, time_budget=data.get("timeout_seconds"),
+                                         organizer=data.get("organizer"), debug_timing=debug_timing_requested())
+    g.outcome = no_show_outcome(response)
+    return jsonify(response), status
+
+# ===================== ASYNC JOBS =====================
+
+job_queue = queue.Queue(maxsize=JOB_QUEUE_SIZE)
+# Queued and running jobs never expire; finished ones stay pollable for JOB_RETENTION
+jobs = LRUCache(JOB_QUEUE_SIZE * 10)
+job_stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "total_wait_seconds": 0.0}
+_job_lock = threading.Lock()
+_job_workers = []
+
+def submit_job(start_time, end_time, invitee, callback_url=None, refresh=False, time_budget=None, organizer=None):
+    """Queue a unified check; returns the job record, or None when the queue is full.
+
+    The time budget starts counting when a worker picks the job up.
+    """
+    start_job_workers()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "status": "queued",
+        "request": {"start_time": start_time, "end_time": end_time, "invitee": invitee, "organizer": organizer},
+        "refresh": refresh,
+        "time_budget": time_budget,
+        "callback_url": callback_url,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None
+    }
+    jobs.set(job["job_id"], job)
+    try:
+        job_queue.put_nowait(job["job_id"])
+    except queue.Full:
+        jobs.pop(job["job_id"])
+        with _job_lock:
+            job_stats["rejected"] += 1
+        return None
+    with _job_lock:
+        job_stats["submitted"] += 1
+    return job
+
+def validate_callback_url(callback_url):
+    """Why a job callback URL is not acceptable, or None if it is.
+
+    Results contain attendee emails, so they only go to https URLs on a
+    JOB_CALLBACK_ALLOWED_HOSTS host or, when no allowlist is configured, on
+    a host whose every address is public. The addresses are checked again
+    right before delivery.
+    """
+    if callback_url is None:
+        return None
+    if not isinstance(callback_url, str):
+        return "callback_url must be a string"
+    try:
+        parts = urllib.parse.urlsplit(callback_url)
+        host, port = (parts.hostname or "").lower(), parts.port or 443
+    except ValueError:
+        return "callback_url must be an https URL"
+    if parts.scheme != "https" or not host:
+        return "callback_url must be an https URL"
+    if JOB_CALLBACK_ALLOWED_HOSTS:
+        return None if host in JOB_CALLBACK_ALLOWED_HOSTS else f"callback_url host {host} is not allowed"
+    return callback_address_error(host, port)
+
+def callback_address_error(host, port):
+    """Why host may not receive callbacks, or None if everything it resolves to is a public address.
+
+    Resolving catches the numeric forms (2130706433, 0x7f000001, 127.1) and
+    DNS names that point at private or metadata addresses.
+    """
+    try:
+        addresses = {info[4][0].split("%", 1)[0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError) as e:
+        return f"callback_url host {host} could not be resolved: {e}"
+    for address in addresses:
+        if not ipaddress.ip_address(address).is_global:
+            return f"callback_url host {host} resolves to non-public address {address}"
+    return None
+
+def deliver_job_callback(job):
+    """POST the finished job to its callback URL, once and without following redirects"""
+    try:
+        # DNS may have changed since submission
+        error = validate_callback_url(job["callback_url"])
+        if error:
+            raise ValueError(error)
+        resp = callback_session.post(job["callback_url"], json=job_view(job), timeout=JOB_CALLBACK_TIMEOUT,
+                                     allow_redirects=False)
+        job["callback_status"] = resp.status_code
+    except Exception as e:
+        logger.warning(f"[JOBS] Callback for {job['job_id']} failed: {e}")
+        job["callback_status"] = str(e)
+
+def _job_worker_loop():
+    while True:
+        job_id = job_queue.get()
+        job = jobs.get(job_id)
+        if job is None:
+            job_queue.task_done()
+            continue
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        with _job_lock:
+            job_stats["total_wait_seconds"] += job["started_at"] - job["created_at"]
+        try:
+            params = job["request"]
+            response, status = run_unified_check(params["start_time"], params["end_time"], params["invitee"],
+                                                 refresh=job["refresh"], time_budget=job["time_budget"],
+                                                 organizer=params["organizer"])
+            job["result"] = response
+            job["status"] = "done"
+            with _job_lock:
+                job_stats["completed"] += 1
+        except Exception as e:
+            logger.error(f"[JOBS] Job {job_id} failed: {e}")
+            job["result"] = {"no_show": "incorrect data", "error": f"Processing error: {str(e)}"}
+            job["status"] = "failed"
+            with _job_lock:
+                job_stats["failed"] += 1
+        job["finished_at"] = time.time()
+        # Re-store so the retention period counts from completion
+        jobs.set(job_id, job, ttl=JOB_RETENTION)
+        if job["callback_url"]:
+            deliver_job_callback(job)
+        job_queue.task_done()
+
+def start_job_workers():
+    """Start the job worker threads on first use"""
+    with _job_lock:
+        while len(_job_workers) < JOB_WORKERS:
+            thread = threading.Thread(target=_job_worker_loop, name=f"job-worker-{len(_job_workers)}", daemon=True)
+            thread.start()
+            _job_workers.append(thread)
+
+def job_view(job):
+    """Public representation of a job record"""
+    view = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "request": job["request"],
+        "wait_seconds": round((job["started_at"] or time.time()) - job["created_at"], 3)
+    }
+    if job["finished_at"]:
+        view["run_seconds"] = round(job["finished_at"] - job["started_at"], 3)
+        view["result"] = job["result"]
+    if "callback_status" in job:
+        view["callback_status"] = job["callback_status"]
+    return view
+
+def job_queue_stats():
+    with job_queue.mutex:
+        queued_ids = list(job_queue.queue)
+    oldest = jobs.get(queued_ids[0]) if queued_ids else None
+    with _job_lock:
+        started = job_stats["completed"] + job_stats["failed"]
+        return {
+            "workers": JOB_WORKERS,
+            "queue_depth": len(queued_ids),
+            "oldest_queued_wait_seconds": round(time.time() - oldest["created_at"], 3) if oldest else 0,
+            "avg_wait_seconds": round(job_stats["total_wait_seconds"] / started, 3) if started else 0,
+            **{key: value for key, value in job_stats.items() if key != "total_wait_seconds"}
+        }
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll the status and result of an asynchronous check"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job_id"}), 404
+    return jsonify(job_view(job))
+
+# ===================== BATCH ENDPOINT =====================
+
+class BatchWindow:
+    """Upstream data for a cluster of batch items whose time windows overlap.
+
+    The calendars, the Reports window and the callRecords window are each
+    fetched at most once, on first use, and shared by every item in the cluster.
+    A fetch that came back incomplete marks every item that uses it partial.
+    """
+    
+    def __init__(self, items):
+        windows = [item["calendar_window"] for item in items]
+        self.time_min = min(window[0] for window in windows)
+        self.time_max = max(window[1] for window in windows)
+        report_windows = [meet_report_window(item["start_dt"]) for item in items]
+        self.report_start = min(window[0] for window in report_windows)
+        self.report_end = max(window[1] for window in report_windows)
+        self.start_min = min(item["start_dt"] for item in items)
+        self.end_max = max(item["end_dt"] or item["start_dt"] for item in items)
+        self.invitees = {item["invitee"] for item in items}
+        self._lock = threading.Lock()
+        self._calendar_events = None
+        self._meet_activities = None
+        self._call_records = None
+        self._incomplete = set()
+    
+    def _shared_fetch(self, name, fetch):
+        """Run fetch under its own deadline, so truncation is recorded for the cluster, not just this item"""
+        deadline = current_deadline.get()
+        fetch_deadline = Deadline(deadline.remaining() if deadline else UNIFIED_CHECK_TIMEOUT)
+        token = current_deadline.set(fetch_deadline)
+        try:
+            result = fetch()
+        finally:
+            current_deadline.reset(token)
+        if fetch_deadline.exceeded:
+            logger.warning(f"[BATCH] Shared {name} fetch was incomplete")
+            self._incomplete.add(name)
+        return result
+    
+    def _check_complete(self, name):
+        if name in self._incomplete:
+            mark_partial()
+    
+    def calendar_events(self, invitee):
+        with self._lock:
+            if self._calendar_events is None:
+                self._calendar_events = self._shared_fetch("calendar", self._fetch_calendar_events)
+        self._check_complete("calendar")
+        return [(email, event) for email, event in self._calendar_events
+                if invitee in {a.get('email', '').lower() for a in event.get('attendees', [])}]
+    
+    def _fetch_calendar_events(self):
+        # Index coverage depends only on the window, so it is the same for every invitee
+        indexed, live_calendars = [], None
+        for invitee in self.invitees:
+            result = lookup_indexed_events(self.time_min, self.time_max, invitee)
+            if result is None:
+                indexed, live_calendars = [], None
+                break
+            events, live_calendars = result
+            indexed.extend(events)
+        if live_calendars is not None and not live_calendars:
+            return indexed
+        
+        def match_event(email, event):
+            attendees = {a.get('email', '').lower() for a in event.get('attendees', []) if 'email' in a}
+            return event if attendees & self.invitees else None
+        
+        return indexed + scan_internal_calendars(self.time_min, self.time_max, match_event, log_prefix="[BATCH]",
+                                                 calendars=live_calendars)
+    
+    def meet_activities(self, start_time, end_time):
+        with self._lock:
+            if self._meet_activities is None:
+                self._meet_activities = self._shared_fetch(
+                    "reports", lambda: list(iter_meet_activities(self.report_start, self.report_end))
+                )
+        self._check_complete("reports")
+        start_dt, end_dt = parser.isoparse(start_time), parser.isoparse(end_time)
+        return [activity for activity in self._meet_activities
+                if start_dt <= parser.isoparse(activity.get("id", {}).get("time", start_time)) <= end_dt]
+    
+    def call_records(self, token, start_time, end_time):
+        with self._lock:
+            if self._call_records is None:
+                self._call_records = self._shared_fetch("call_records", lambda: list(find_meetings_in_timerange(
+                    token, format_utc_time(self.start_min.timestamp()), format_utc_time(self.end_max.timestamp())
+                )))
+        self._check_complete("call_records")
+        # Same bounds as the $filter in find_meetings_in_timerange
+        start_filter = parser.isoparse(start_time) - timedelta(minutes=5)
+        end_filter = parser.isoparse(end_time) + timedelta(minutes=5)
+        return [record for record in self._call_records
+                if record.get("startDateTime")
+                and start_filter <= parser.isoparse(record["startDateTime"]) < end_filter]
+
+def as_utc(dt):
+    """Naive datetimes are taken as UTC, as meet_report_window formats them"""
+    return dt.replace(tzinfo=pytz.utc) if dt is not None and dt.tzinfo is None else dt
+
+def cluster_batch_items(items):
+    """Group batch items into clusters whose calendar windows overlap, capped at BATCH_MAX_WINDOW"""
+    clusters = []
+    for item in sorted(items, key=lambda item: item["calendar_window"][0]):
+        if clusters:
+            cluster = clusters[-1]
+            cluster_min = cluster[0]["calendar_window"][0]
+            cluster_max = max(other["calendar_window"][1] for other in cluster)
+            if (item["calendar_window"][0] <= cluster_max and
+                    max(cluster_max, item["calendar_window"][1]) - cluster_min <= BATCH_MAX_WINDOW):
+                cluster.append(item)
+                continue
+        clusters.append([item])
+    return clusters
+
+@app.route('/check_meeting_batch', methods=['POST'])
+def check_meeting_batch():
+    """Check many meetings at once, streaming one NDJSON result line per item as it finishes"""
+    data = request.get_json()
+    raw_items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({"error": "Expected a non-empty list of items"}), 400
+    refresh = (isinstance(data, dict) and bool(data.get("refresh"))) or \
+        "no-cache" in request.headers.get("Cache-Control", "")
+    # One time budget for the whole batch, so it never holds the worker thread longer than that
+    batch_deadline = Deadline(request_time_budget(data.get("timeout_seconds") if isinstance(data, dict) else None))
+    
+    # Items that fail validation are answered directly, the rest are clustered by window
+    immediate = []
+    items = []
+    for index, raw in enumerate(raw_items):
+        raw = raw if isinstance(raw, dict) else {}
+        start_time, end_time, invitee = raw.get("start_time"), raw.get("end_time"), raw.get("invitee")
+        try:
+            start_dt = parser.isoparse(start_time)
+            end_dt = parser.isoparse(end_time) if end_time else None
+            # Mixing naive and aware times fails the check itself; it shouldn't fail the clustering
+            if end_dt and (start_dt.tzinfo is None) != (end_dt.tzinfo is None):
+                raise ValueError("start_time and end_time mix naive and aware times")
+            # Clustering compares items with each other, so naive times are taken as UTC
+            start_dt, end_dt = as_utc(start_dt), as_utc(end_dt)
+            calendar_window = unified_calendar_window(start_dt, end_dt)
+        except Exception:
+            immediate.append(index)
+            continue
+        if not invitee or not isinstance(invitee, str):
+            immediate.append(index)
+            continue
+        items.append({
+            "index": index,
+            "refresh": refresh or bool(raw.get("refresh")),
+            "start_time": start_time,
+            "end_time": end_time,
+            "invitee": invitee.lower(),
+            "start_dt": start_dt,
+            "end_dt": end_dt,
+            "calendar_window": calendar_window
+        })
+    clusters = cluster_batch_items(items)
+    logger.info(f"[BATCH] {len(raw_items)} item(s) in {len(clusters)} time window cluster(s)")
+    
+    def result_line(index, response, status):
+        return json.dumps({"index": index, "status": status, "result": response}) + "\n"
+    
+    debug_timing = debug_timing_requested()
+    
+    def run_item(item, batch_window):
+        # Each item gets a normal check budget, cut to what is left of the batch's. Below the
+        # one-second minimum a check can't fit in the batch budget, so it isn't started.
+        remaining = batch_deadline.remaining()
+        if remaining < 1.0:
+            return {
+                "no_show": "NA",
+                "partial": True,
+                "error": "Batch time budget exhausted before this item ran"
+            }, 200
+        return run_unified_check(item["start_time"], item["end_time"], item["invitee"], batch_window,
+                                 item["refresh"], time_budget=min(UNIFIED_CHECK_TIMEOUT, remaining),
+                                 debug_timing=debug_timing)
+    
+    def generate():
+        for index in immediate:
+            raw = raw_items[index] if isinstance(raw_items[index], dict) else {}
+            try:
+                response, status = run_unified_check(raw.get("start_time"), raw.get("end_time"), raw.get("invitee"))
+            except Exception as e:
+                response, status = {"no_show": "incorrect data", "error": f"Processing error: {str(e)}"}, 200
+            yield result_line(index, response, status)
+        
+        # Every cluster is queued up front so BATCH_CONCURRENCY spans clusters, not just one at a time
+        executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="batch")
+        try:
+            futures = {}
+            for cluster in clusters:
+                batch_window = BatchWindow(cluster)
+                for item in cluster:
+                    futures[executor.submit(run_item, item, batch_window)] = item["index"]
+            for future in as_completed(futures):
+                try:
+                    response, status = future.result()
+                except Exception as e:
+                    response, status = {"no_show": "incorrect data", "error": f"Processing error: {str(e)}"}, 200
+                yield result_line(futures[future], response, status)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this process"""
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Cache, token and startup counters for this process"""
+    return jsonify({
+        "graph_token": dict(token_stats),
+        "calendar_credentials_pool": calendar_credentials_pool.stats(),
+        "graph_user_cache": user_details_cache.stats(),
+        "call_record_cache": call_record_cache.stats(),
+        "meet_store": meet_store_stats(),
+        "calendly_cache": calendly_cache_stats(),
+        "internal_identities": internal_identity_stats(),
+        "calendar_index": calendar_index_stats(),
+        "calendar_probe_ranking": calendar_hit_stats(),
+        "jobs": job_queue_stats(),
+        "result_cache": result_cache.stats(),
+        "startup": startup_view()
+    })
 
 @app.route('/')
 def home():
     return jsonify({
         "message": "Unified Meeting No-Show Detection API",
         "endpoints": {
-            "/check_meeting_unified": "POST - Check both Google Meet and Teams meetings"
+            "/check_meeting_unified": "POST - Check both Google Meet and Teams meetings",
+            "/check_meeting_batch": "POST - Check a list of meetings, streaming NDJSON results as they finish",
+            "/jobs/<job_id>": "GET - Status and result of an asynchronous check",
+            "/internal_identities/reload": "POST - Reload internal users from config and directory sources",
+            "/ready": "GET - Readiness probe; optionally pre-warms clients and tokens (READY_PREWARM or ?prewarm=1)",
+            "/stats": "GET - Cache, token and startup counters for this process",
+            "/metrics": "GET - Prometheus metrics: request, upstream and cache counters and latencies"
         },
         "input_format": {
             "start_time": "ISO format datetime (required)",
             "end_time": "ISO format datetime (required for Teams, optional for Google Meet)",
-            "invitee": "Email address of the invitee (required)"
+            "invitee": "Email address of the invitee (required)",
+            "async": "If true, queue the check and return a job_id immediately (optional)",
+            "callback_url": "https URL that receives the finished job as a POST in async mode (optional)",
+            "refresh": "If true, bypass the result cache (optional; also honours Cache-Control: no-cache)",
+            "timeout_seconds": "Time budget for the check; partial results are returned when it runs out (optional)",
+            "organizer": "Internal calendar most likely to hold the meeting, probed first (optional)"
         },
         "output_format": {
             "search_criteria": "Input parameters used for search",
@@ -990,10 +3348,16 @@ def home():
         "notes": {
             "1": "If end_time is not provided, only Google Meet will be checked",
             "2": "Platform detection: URLs with 'calendly' are marked as 'Microsoft Teams (Calendly)'",
-            "3": "If meeting is found in both platforms, Teams takes priority"
+            "3": "If meeting is found in both platforms, Teams takes priority",
+            "4": "Settled true/false results are cached; responses served from cache include \"cached\": true",
+            "5": "Responses cut short by the time budget include \"partial\": true and are not cached",
+            "6": "Send X-Debug-Timing: 1 to get a nested per-phase and per-upstream-call timing breakdown"
         }
     })
 
+startup_stats["import_seconds"] = record_startup_milestone("import")
+logger.info(f"[STARTUP] App imported in {startup_stats['import_seconds']}s")
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
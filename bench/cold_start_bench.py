@@ -0,0 +1,56 @@
+"""Cold-start benchmark: import-to-first-response time of app.py.
+
+Starts a fresh interpreter per run, imports app and serves one request
+through the Flask test client, and reports the import time and the time
+from the start of the import to the first response (best and median over
+the runs). No upstream is contacted.
+
+    python bench/cold_start_bench.py [--runs 10] [--path /ready]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started_at = time.perf_counter()
+import app
+imported_at = time.perf_counter()
+response = app.app.test_client().get(sys.argv[1])
+responded_at = time.perf_counter()
+print(json.dumps({"status": response.status_code, "import": imported_at - started_at,
+                  "first_response": responded_at - started_at}))
+"""
+
+def run_once(path, env):
+    output = subprocess.run([sys.executable, "-c", CHILD, path], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--runs", type=int, default=10)
+    arg_parser.add_argument("--path", default="/ready", help="endpoint served as the first response")
+    args = arg_parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT, CALENDAR_SYNC_INTERVAL="0", MEET_INGEST_INTERVAL="0",
+               LOCAL_STORE_PATH=os.path.join(tempfile.mkdtemp(prefix="noshow-bench-"), "store.sqlite3"))
+    env.setdefault("MICROSOFT_CLIENT_ID", "bench")
+    env.setdefault("MICROSOFT_CLIENT_SECRET", "bench")
+    env.setdefault("MICROSOFT_TENANT_ID", "bench-tenant")
+
+    runs = [run_once(args.path, env) for _ in range(args.runs)]
+    print(f"{args.runs} cold starts, first request GET {args.path} -> {runs[-1]['status']}")
+    for key in ("import", "first_response"):
+        values = [run[key] * 1000 for run in runs]
+        print(f"  {key:<15} best {min(values):7.1f} ms   median {statistics.median(values):7.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Local stand-in for the Google, Microsoft and Calendly endpoints app.py calls.
+
+Serves the scenario fixtures in fixtures/unified_scenarios.json over plain
+HTTP. Requests arrive as /<original host><original path>, which is how
+unified_bench.py routes app.py's pooled sessions here. Every response is
+delayed by the configured per-upstream latency, and every request is
+counted per upstream so the harness can report call counts.
+
+    python bench/fake_upstreams.py [--port 0] [--latency-ms 10] [--latency calendly=150]
+
+Prints the listening port on the first line of stdout.
+
+Control endpoints:
+    POST /_bench/scenario   {"name": ...}   serve that scenario, reset counts
+    GET  /_bench/counts                     requests per upstream since then
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES = os.path.join(ROOT, "fixtures", "unified_scenarios.json")
+
+TOKEN = {"access_token": "bench-token", "token_type": "Bearer", "expires_in": 3600}
+
+# ===================== FIXTURES =====================
+
+def expand_scenario(scenario):
+    """Expand the generated attendee and participant lists of a large scenario"""
+    scenario = copy.deepcopy(scenario)
+    for events in scenario.get("calendar", {}).values():
+        for event in events:
+            extra = event.pop("extra_attendees", None)
+            if extra:
+                event.setdefault("attendees", []).extend(
+                    {"email": f"{extra['prefix']}{n:04d}@{extra['domain']}"} for n in range(extra["count"])
+                )
+    generated = scenario.get("reports_generated")
+    if generated:
+        for n in range(generated["count"]):
+            email = f"{generated['prefix']}{n:04d}@{generated['domain']}"
+            scenario.setdefault("reports", []).append({
+                "id": {"time": generated["time"]},
+                "actor": {"email": email},
+                "events": [{"parameters": [
+                    {"name": "meeting_code", "value": generated["meeting_code"]},
+                    {"name": "identifier", "value": email},
+                    {"name": "organizer_email", "value": generated["organizer"]}
+                ]}]
+            })
+    return scenario
+
+def load_scenarios(path):
+    with open(path) as f:
+        fixtures = json.load(f)
+    return {name: expand_scenario(scenario) for name, scenario in fixtures["scenarios"].items()}
+
+# ===================== UPSTREAMS =====================
+
+def parse_time(value):
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() if value else None
+
+def paginate(items, params, default_size):
+    """One page of items for maxResults/pageToken, with nextPageToken when more remain"""
+    size = int(params.get("maxResults", default_size))
+    offset = int(params.get("pageToken", 0))
+    page = {"items": items[offset:offset + size]}
+    if offset + size < len(items):
+        page["nextPageToken"] = str(offset + size)
+    return page
+
+def calendar_events(scenario, calendar_id, params):
+    """events().list for one calendar: singleEvents in [timeMin, timeMax), free-text q over attendees"""
+    time_min, time_max = parse_time(params.get("timeMin")), parse_time(params.get("timeMax"))
+    query = params.get("q", "").lower()
+    items = []
+    for event in scenario.get("calendar", {}).get(calendar_id, []):
+        start, end = parse_time(event["start"]["dateTime"]), parse_time(event["end"]["dateTime"])
+        if time_min and end <= time_min or time_max and start >= time_max:
+            continue
+        if query and query not in json.dumps(event).lower():
+            continue
+        items.append(event)
+    return paginate(items, params, 250)
+
+def meet_activities(scenario, params):
+    """activities().list for Meet: activities in [startTime, endTime], honouring a meeting_code==X filter"""
+    start, end = parse_time(params.get("startTime")), parse_time(params.get("endTime"))
+    items = [item for item in scenario.get("reports", [])
+             if not (start and parse_time(item["id"]["time"]) < start or end and parse_time(item["id"]["time"]) > end)]
+    match = re.match(r"meeting_code==(\w+)", params.get("filters", ""))
+    if match:
+        items = [item for item in items if any(
+            parameter.get("value") == match.group(1)
+            for event in item["events"] for parameter in event["parameters"] if parameter["name"] == "meeting_code"
+        )]
+    return paginate(items, params, 1000)
+
+def call_records(scenario, params):
+    """callRecords list, honouring the startDateTime ge X and startDateTime lt Y $filter"""
+    records = scenario.get("call_records", [])
+    match = re.search(r"startDateTime ge (\S+) and startDateTime lt (\S+)", params.get("$filter", ""))
+    if match:
+        start, end = parse_time(match.group(1)), parse_time(match.group(2))
+        records = [record for record in records if start <= parse_time(record["startDateTime"]) < end]
+    return {"value": records}
+
+def graph_batch(scenario, body):
+    users = scenario.get("users", {})
+    responses = []
+    for item in json.loads(body)["requests"]:
+        user_id = urllib.parse.urlsplit(item["url"]).path.rsplit("/", 1)[-1]
+        if user_id in users:
+            responses.append({"id": item["id"], "status": 200, "body": users[user_id]})
+        else:
+            responses.append({"id": item["id"], "status": 404, "body": {"error": {"code": "Request_ResourceNotFound"}}})
+    return {"responses": responses}
+
+def microsoft_login(path):
+    """Instance discovery, tenant metadata and client-credentials tokens for MSAL"""
+    if path.endswith("/oauth2/v2.0/token"):
+        return TOKEN
+    tenant = path.strip("/").split("/")[0]
+    if "discovery/instance" in path:
+        return {
+            "tenant_discovery_endpoint":
+                f"https://login.microsoftonline.com/{tenant}/v2.0/.well-known/openid-configuration",
+            "api-version": "1.1",
+            "metadata": [{"preferred_network": "login.microsoftonline.com",
+                          "preferred_cache": "login.windows.net",
+                          "aliases": ["login.microsoftonline.com", "login.windows.net"]}]
+        }
+    base = f"https://login.microsoftonline.com/{tenant}"
+    return {
+        "authorization_endpoint": f"{base}/oauth2/v2.0/authorize",
+        "token_endpoint": f"{base}/oauth2/v2.0/token",
+        "issuer": f"{base}/v2.0"
+    }
+
+def upstream_of(host, path):
+    """Upstream label, named as app.upstream_name names them"""
+    if host == "graph.microsoft.com":
+        if "/callRecords" in path:
+            return "graph_call_records"
+        if path.endswith("/$batch"):
+            return "graph_users_batch"
+        return "graph_users" if "/users" in path else "graph"
+    if host == "login.microsoftonline.com":
+        return "graph_token"
+    if host == "oauth2.googleapis.com":
+        return "google_token"
+    if path.startswith("/calendar/"):
+        return "calendar"
+    if path.startswith("/admin/reports/"):
+        return "reports"
+    if host.endswith("calendly.com"):
+        return "calendly"
+    if host.startswith("teams."):
+        return "teams_web"
+    return "other"
+
+# ===================== SERVER =====================
+
+class FakeUpstreams(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, scenarios, latency):
+        super().__init__(address, UpstreamHandler)
+        self.scenarios = scenarios
+        self.latency = latency
+        self.scenario = {}
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def do_HEAD(self):
+        self.dispatch()
+
+    def reply(self, status, body=None, headers=None):
+        payload = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None and not isinstance(body, bytes):
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def dispatch(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+
+        if url.path == "/_bench/scenario":
+            with server.lock:
+                server.scenario = server.scenarios[json.loads(body)["name"]]
+                server.counts.clear()
+            return self.reply(200, {"ok": True})
+        if url.path == "/_bench/counts":
+            with server.lock:
+                return self.reply(200, dict(server.counts))
+
+        host, _, path = url.path.lstrip("/").partition("/")
+        path = "/" + path
+        upstream = upstream_of(host, path)
+        with server.lock:
+            server.counts[upstream] += 1
+            scenario = server.scenario
+        delay = server.latency.get(upstream, server.latency["*"])
+        if delay:
+            time.sleep(delay)
+
+        if upstream in ("google_token", "graph_token"):
+            return self.reply(200, TOKEN if upstream == "google_token" else microsoft_login(path))
+        if upstream == "calendar":
+            match = re.match(r"/calendar/v3/calendars/([^/]+)/events$", path)
+            if match:
+                return self.reply(200, calendar_events(scenario, urllib.parse.unquote(match.group(1)), params))
+        if upstream == "reports":
+            return self.reply(200, meet_activities(scenario, params))
+        if upstream == "graph_call_records":
+            record_id = path.rsplit("/callRecords", 1)[1].strip("/")
+            if not record_id:
+                return self.reply(200, call_records(scenario, params))
+            details = scenario.get("call_record_details", {}).get(record_id)
+            return self.reply(200, details) if details else self.reply(404, {"error": {"code": "NotFound"}})
+        if upstream == "graph_users_batch":
+            return self.reply(200, graph_batch(scenario, body))
+        if upstream == "calendly":
+            # Event text reaches the resolver lower-cased, so match links case-insensitively
+            link = {key.lower(): value for key, value in scenario.get("calendly", {}).items()}.get(path.lower())
+            if link and link.get("location"):
+                return self.reply(302, b"", {"Location": link["location"]})
+            if link and link.get("page"):
+                return self.reply(200, link["page"].encode(), {"Content-Type": "text/html"})
+        if upstream == "teams_web":
+            return self.reply(200, b"", {"Content-Type": "text/html"})
+        return self.reply(404, {"error": f"no fixture for {host}{path}"})
+
+def parse_latency(latency_ms, overrides):
+    latency = {"*": latency_ms / 1000}
+    for override in overrides:
+        upstream, _, ms = override.partition("=")
+        latency[upstream] = float(ms) / 1000
+    return latency
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    arg_parser.add_argument("--port", type=int, default=0)
+    arg_parser.add_argument("--latency-ms", type=float, default=10, help="delay before every response")
+    arg_parser.add_argument("--latency", action="append", default=[], metavar="UPSTREAM=MS",
+                            help="per-upstream delay, e.g. calendly=150")
+    args = arg_parser.parse_args()
+
+    server = FakeUpstreams(("127.0.0.1", args.port), load_scenarios(args.fixtures),
+                           parse_latency(args.latency_ms, args.latency))
+    print(server.server_port, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
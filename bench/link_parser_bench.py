@@ -0,0 +1,242 @@
+"""Microbenchmark and equivalence check for the Teams/Meet link parser.
+
+Runs the precompiled parser in app.py and the original implementation over
+the event corpus in link_corpus.json, fails if any result differs, and prints
+the time per event for both. Also times a single combined alternation of the
+Teams ID patterns, the approach app.py deliberately does not use.
+
+    python bench/link_parser_bench.py [--repeat N]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import timeit
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Importing app must not start background workers or need real tenants
+os.environ.setdefault('MICROSOFT_CLIENT_ID', 'bench')
+os.environ.setdefault('MICROSOFT_CLIENT_SECRET', 'bench')
+os.environ.setdefault('MICROSOFT_TENANT_ID', 'bench')
+os.environ.setdefault('CALENDAR_SYNC_INTERVAL', '0')
+os.environ.setdefault('MEET_INGEST_INTERVAL', '0')
+os.chdir(ROOT)
+
+import app  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+# ===================== ORIGINAL IMPLEMENTATION =====================
+
+def legacy_extract_meet_id(link):
+    if not link:
+        return None
+    match = re.search(r'meet\.google\.com/([\w-]+)', link)
+    if match:
+        return match.group(1).replace('-', '')
+    return None
+
+def legacy_detect_teams_meeting(event):
+    location = event.get('location', '').lower()
+    description = event.get('description', '').lower()
+
+    teams_indicators = ['teams.microsoft.com', 'teams.live.com', 'teams meeting', 'calendly.com']
+
+    for indicator in teams_indicators:
+        if indicator in location or indicator in description:
+            if 'calendly.com' in location or 'calendly.com' in description:
+                calendly_match = re.search(r'https://[^\s]*calendly[^\s]*', location + ' ' + description)
+                if calendly_match:
+                    return calendly_match.group(0)
+
+            teams_link_match = re.search(r'https://[^\s]*teams[^\s]*', location + ' ' + description)
+            if teams_link_match:
+                return teams_link_match.group(0)
+
+    return None
+
+def legacy_extract_teams_id_from_direct_url(teams_url):
+    if not teams_url:
+        return None
+
+    original_url = teams_url
+    if '%' in teams_url:
+        teams_url = urllib.parse.unquote(teams_url)
+        app.logger.info(f"URL decoded from: {original_url}")
+        app.logger.info(f"URL decoded to: {teams_url}")
+
+    patterns = [
+        r'(19:meeting_[^/\s@\?]+@thread\.v2)',
+        r'(meeting_[^/\s@\?]+@thread\.v2)',
+        r'19%3Ameeting_([^%/\s@\?]+)%40thread\.v2',
+        r'meeting_([^%/\s@\?]+)%40thread\.v2',
+        r'teams\.microsoft\.com/.*meetup-join/(\d+)/(\w+)',
+        r'teams\.microsoft\.com/l/meetup-join/([^/\?]+)',
+        r'thread\.v2/([^/\?]+)',
+        r'meetingId=([^&\s]+)',
+        r'conference[Ii]d=([^&\s]+)',
+        r'teams\.live\.com/meet/([^/\?]+)',
+        r'orgid=([^&\s]+)',
+        r'meetings/([A-Za-z0-9+/=_-]+)',
+        r'join/([A-Za-z0-9+/=_-]+)',
+    ]
+
+    for i, pattern in enumerate(patterns):
+        match = re.search(pattern, teams_url, re.IGNORECASE)
+        if match:
+            if i < 4:
+                if match.group(0).startswith('19:'):
+                    meeting_id = match.group(0)
+                elif match.group(0).startswith('meeting_'):
+                    meeting_id = f"19:{match.group(0)}"
+                else:
+                    meeting_id = f"19:meeting_{match.group(1)}@thread.v2"
+            else:
+                meeting_id = match.group(1) if len(match.groups()) == 1 else f"{match.group(1)}_{match.group(2)}"
+            app.logger.info(f"Extracted Teams meeting ID using pattern {i}: {meeting_id}")
+            return meeting_id
+    app.logger.warning(f"Could not extract meeting ID from Teams URL: {teams_url}")
+    return None
+
+def legacy_scan_calendly_page(content):
+    teams_patterns = [
+        r'https://teams\.microsoft\.com/l/meetup-join/[^\s"\']+',
+        r'https://teams\.live\.com/meet/[^\s"\']+',
+        r'"joinUrl":"([^"]*teams[^"]*)"',
+        r'teams\.microsoft\.com[^"\']*',
+        r'19:meeting_[^"\'@\s]+@thread\.v2',
+        r'meeting_[^"\'@\s]+@thread\.v2'
+    ]
+    for pattern in teams_patterns:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            return match.group(1) if 'joinUrl' in pattern else match.group(0)
+    return None
+
+# ===================== PRECOMPILED IMPLEMENTATION =====================
+
+def scan_calendly_page(content):
+    i, match = app.first_match(app.CALENDLY_PAGE_PATTERNS, content)
+    if match:
+        return match.group(1) if i == 2 else match.group(0)
+    return None
+
+# ===================== COMBINED ALTERNATION =====================
+
+def build_alternations(patterns):
+    """alternations[k] matches any of the first k + 1 patterns, each wrapped in its own group"""
+    alternations, pattern_by_group, parts = [], {}, []
+    group = 1
+    for index, pattern in enumerate(patterns):
+        pattern_by_group[group] = index
+        parts.append(f"({pattern.pattern})")
+        group += pattern.groups + 1
+        alternations.append(re.compile("|".join(parts), patterns[0].flags))
+    return alternations, pattern_by_group
+
+TEAMS_ID_ALTERNATIONS = build_alternations(app.TEAMS_ID_PATTERNS)
+
+def alternation_first_match(text):
+    """Priority-order first match using the combined alternation.
+
+    The leftmost alternation match names a pattern; only patterns before it
+    can still win, so the scan resumes after it with just those.
+    """
+    alternations, pattern_by_group = TEAMS_ID_ALTERNATIONS
+    found, pos, limit = None, 0, len(alternations)
+    while limit:
+        match = alternations[limit - 1].search(text, pos)
+        if match is None:
+            break
+        found = limit = pattern_by_group[match.lastindex]
+        pos = match.start() + 1
+    return found
+
+def parse_event(event, detect, extract_teams_id, extract_meet):
+    """Everything the matchers pull out of one calendar event"""
+    teams_link = detect(event)
+    return (
+        teams_link,
+        extract_teams_id(teams_link) if teams_link and 'calendly' not in teams_link else None,
+        extract_meet(event.get('hangoutLink', '')),
+        extract_meet(event.get('description', ''))
+    )
+
+def legacy_parse_event(event):
+    return parse_event(event, legacy_detect_teams_meeting, legacy_extract_teams_id_from_direct_url,
+                       legacy_extract_meet_id)
+
+def compiled_parse_event(event):
+    return parse_event(event, app.detect_teams_meeting, app.extract_teams_id_from_direct_url, app.extract_meet_id)
+
+def iter_teams_urls(corpus):
+    """Decoded links from the corpus, as extract_teams_id_from_direct_url searches them"""
+    for event in corpus["events"]:
+        for link in re.findall(r'https://\S+', event.get("description", "")):
+            yield urllib.parse.unquote(link)
+
+def check_equivalence(corpus):
+    """Return a list of (kind, input, legacy, compiled) for every differing result"""
+    mismatches = []
+    for event in corpus["events"]:
+        legacy, compiled = legacy_parse_event(event), compiled_parse_event(event)
+        if legacy != compiled:
+            mismatches.append((event.get("kind"), event.get("description", "")[:80], legacy, compiled))
+        # Every link in the text on its own, not only the one detect_teams_meeting picks
+        for link in re.findall(r'https://\S+', event.get("description", "")):
+            legacy, compiled = legacy_extract_teams_id_from_direct_url(link), app.extract_teams_id_from_direct_url(link)
+            if legacy != compiled:
+                mismatches.append(("link", link, legacy, compiled))
+    for link in iter_teams_urls(corpus):
+        legacy, alternation = app.first_match(app.TEAMS_ID_PATTERNS, link)[0], alternation_first_match(link)
+        if legacy != alternation:
+            mismatches.append(("alternation", link, legacy, alternation))
+    for page in corpus["calendly_pages"]:
+        legacy, compiled = legacy_scan_calendly_page(page), scan_calendly_page(page)
+        if legacy != compiled:
+            mismatches.append(("calendly_page", page[-80:], legacy, compiled))
+    return mismatches
+
+def time_per_item(parse, items, repeat):
+    seconds = min(timeit.repeat(lambda: [parse(item) for item in items], number=1, repeat=repeat))
+    return seconds / len(items) * 1e6
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--corpus", default=os.path.join(ROOT, "bench", "link_corpus.json"))
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    with open(args.corpus) as f:
+        corpus = json.load(f)
+
+    mismatches = check_equivalence(corpus)
+    for kind, text, legacy, compiled in mismatches:
+        print(f"MISMATCH [{kind}] {text!r}\n  legacy:   {legacy!r}\n  compiled: {compiled!r}")
+
+    events = corpus["events"]
+    legacy_us = time_per_item(legacy_parse_event, events, args.repeat)
+    compiled_us = time_per_item(compiled_parse_event, events, args.repeat)
+    print(f"{len(events)} events, best of {args.repeat}")
+    print(f"  legacy:      {legacy_us:8.1f} us/event")
+    print(f"  precompiled: {compiled_us:8.1f} us/event ({legacy_us / compiled_us:.2f}x)")
+
+    urls = list(iter_teams_urls(corpus))
+    sequential_us = time_per_item(lambda url: app.first_match(app.TEAMS_ID_PATTERNS, url), urls, args.repeat)
+    alternation_us = time_per_item(alternation_first_match, urls, args.repeat)
+    print(f"{len(urls)} Teams ID searches")
+    print(f"  precompiled, in priority order: {sequential_us:6.2f} us/url")
+    print(f"  combined alternation:           {alternation_us:6.2f} us/url")
+
+    if mismatches:
+        print(f"{len(mismatches)} result(s) differ from the original implementation")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
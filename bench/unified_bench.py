@@ -0,0 +1,245 @@
+"""Benchmark /check_meeting_unified against local fake upstreams.
+
+Starts fake_upstreams.py, routes every call app.py's pooled sessions make
+(Calendar, Admin Reports, Graph, Calendly and both token endpoints) to it,
+and drives /check_meeting_unified through each scenario in
+fixtures/unified_scenarios.json. Per scenario it reports the best wall
+time of --repeat runs, the upstream calls one check makes and its peak
+traced memory, and checks the answer against the scenario's expectation.
+
+Each scenario runs once to warm the process (tokens, delegated credentials,
+discovery documents), then every measured run starts from empty result,
+call record, user and Calendly caches and no calendar hit history, so the
+numbers describe a first check of that meeting on a warm instance.
+
+    python bench/unified_bench.py [--repeat 5] [--latency-ms 10] [--latency calendly=150]
+    python bench/unified_bench.py --write-baseline    # record bench/unified_baseline.json
+
+Exits 1 when an answer is wrong or a scenario makes more upstream calls
+than the baseline. Wall time and memory depend on the machine, so they
+are printed next to the baseline's but only fail the run with
+--gate-timings, and only when --repeat and the latency settings match the
+baseline's.
+
+    python bench/unified_bench.py --gate-timings    # also fail when >--threshold slower or larger
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH = os.path.join(ROOT, "bench")
+sys.path.insert(0, ROOT)
+
+# The app must not start its sync workers or touch the real store
+STORE_DIR = tempfile.mkdtemp(prefix="noshow-bench-")
+os.environ.setdefault('MICROSOFT_CLIENT_ID', 'bench')
+os.environ.setdefault('MICROSOFT_CLIENT_SECRET', 'bench')
+os.environ.setdefault('MICROSOFT_TENANT_ID', 'bench-tenant')
+os.environ['CALENDAR_SYNC_INTERVAL'] = '0'
+os.environ['MEET_INGEST_INTERVAL'] = '0'
+os.environ['IDENTITY_SOURCES'] = ''
+os.environ['LOCAL_STORE_PATH'] = os.path.join(STORE_DIR, 'store.sqlite3')
+os.environ.pop('TRACE_EXPORT_PATH', None)
+os.environ.pop('MSAL_TOKEN_CACHE_FILE', None)
+os.chdir(ROOT)
+
+import app  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+# ===================== FAKE UPSTREAMS =====================
+
+def start_fake_upstreams(fixtures, latency_ms, latency):
+    """Run fake_upstreams.py in its own process, so it doesn't share our CPU time or traced memory"""
+    command = [sys.executable, os.path.join(BENCH, "fake_upstreams.py"), "--fixtures", fixtures,
+               "--latency-ms", str(latency_ms)]
+    for override in latency:
+        command += ["--latency", override]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    port = int(process.stdout.readline())
+    return process, f"http://127.0.0.1:{port}"
+
+def control(base_url, path, body=None):
+    """Talk to the fake's control endpoints directly, not through app's instrumented sessions"""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)
+
+class LocalUpstreamAdapter(app.InstrumentedAdapter):
+    """InstrumentedAdapter that sends every request to the fake upstreams as /<host><path>.
+
+    The prepared request keeps its real URL, so metrics, spans, redirects and
+    retries behave as they do against the real services.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        self.base_url = base_url
+        super().__init__(**kwargs)
+
+    def get_connection(self, url, proxies=None):
+        return self.poolmanager.connection_from_url(self.base_url)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self.get_connection(request.url, proxies)
+
+    def cert_verify(self, conn, url, verify, cert):
+        pass
+
+    def request_url(self, request, proxies):
+        return f"/{urllib.parse.urlsplit(request.url).netloc}{request.path_url}"
+
+def route_to_fake_upstreams(base_url):
+    for session in (app.http_session, app.calendly_session):
+        adapter = session.get_adapter("https://")
+        local = LocalUpstreamAdapter(base_url, upstream=adapter.upstream, max_retries=adapter.max_retries,
+                                     pool_connections=app.HTTP_POOL_SIZE, pool_maxsize=app.HTTP_POOL_SIZE)
+        session.mount("https://", local)
+        session.mount("http://", local)
+
+# ===================== SCENARIOS =====================
+
+def reset_state():
+    """Forget everything one check leaves behind, keeping tokens and credentials"""
+    for cache in (app.result_cache, app.call_record_cache, app.user_details_cache):
+        cache.clear()
+    with app.get_store() as conn:
+        conn.execute("DELETE FROM calendly_links")
+        conn.execute("DELETE FROM calendar_hits")
+
+def run_check(client, scenario):
+    """One /check_meeting_unified call from clean state; returns (response, seconds)"""
+    reset_state()
+    started_at = time.perf_counter()
+    response = client.post('/check_meeting_unified', json={**scenario["request"], "refresh": True})
+    return response.get_json(), time.perf_counter() - started_at
+
+def check_expectation(scenario, response):
+    """Differences between the response and what the scenario expects, as strings"""
+    return [f"{key}: expected {expected!r}, got {response.get(key)!r}"
+            for key, expected in scenario["expect"].items() if response.get(key) != expected]
+
+def measure(client, base_url, name, scenario, repeat):
+    run_check(client, scenario)  # warm-up
+
+    wall_times = []
+    for _ in range(repeat):
+        control(base_url, "/_bench/scenario", {"name": name})
+        response, seconds = run_check(client, scenario)
+        wall_times.append(seconds)
+    calls = control(base_url, "/_bench/counts")
+
+    tracemalloc.start()
+    try:
+        run_check(client, scenario)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_ms": round(min(wall_times) * 1000, 1),
+        "upstream_calls": sum(calls.values()),
+        "calls_by_upstream": dict(sorted(calls.items())),
+        "peak_memory_kb": round(peak / 1024),
+        "errors": check_expectation(scenario, response)
+    }
+
+# ===================== BASELINE =====================
+
+def compare(results, baseline, threshold, timings=True):
+    """Regressions against the baseline, as strings; timings=False compares upstream calls only"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        if result["upstream_calls"] > previous["upstream_calls"]:
+            regressions.append(f"{name}: {result['upstream_calls']} upstream calls, baseline "
+                               f"{previous['upstream_calls']} {previous['calls_by_upstream']}")
+        for key in ("wall_ms", "peak_memory_kb") if timings else ():
+            if result[key] > previous[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {result[key]} is more than {threshold:.0%} over "
+                                   f"baseline {previous[key]}")
+    return regressions
+
+def print_results(results, baseline):
+    print(f"{'scenario':<16} {'wall ms':>9} {'calls':>6} {'peak KiB':>9}   upstream calls")
+    for name, result in results.items():
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        line = f"{name:<16} {result['wall_ms']:>9} {result['upstream_calls']:>6} {result['peak_memory_kb']:>9}"
+        if previous:
+            line += f"   (baseline {previous['wall_ms']} / {previous['upstream_calls']} / {previous['peak_memory_kb']})"
+        print(line)
+        print(f"{'':<16} {', '.join(f'{k}={v}' for k, v in result['calls_by_upstream'].items())}")
+        for error in result["errors"]:
+            print(f"{'':<16} WRONG ANSWER {error}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--fixtures", default=os.path.join(BENCH, "fixtures", "unified_scenarios.json"))
+    arg_parser.add_argument("--baseline", default=os.path.join(BENCH, "unified_baseline.json"))
+    arg_parser.add_argument("--write-baseline", action="store_true", help="record these results as the baseline")
+    arg_parser.add_argument("--scenario", action="append", help="run only these scenarios")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="measured runs per scenario")
+    arg_parser.add_argument("--gate-timings", action="store_true",
+                            help="fail on wall time and memory regressions, for baselines recorded on this machine")
+    arg_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="allowed wall time and memory growth over the baseline with --gate-timings")
+    arg_parser.add_argument("--latency-ms", type=float, default=10, help="fake upstream response delay")
+    arg_parser.add_argument("--latency", action="append", default=[], metavar="UPSTREAM=MS",
+                            help="per-upstream delay, e.g. calendly=150")
+    args = arg_parser.parse_args()
+
+    with open(args.fixtures) as f:
+        scenarios = json.load(f)["scenarios"]
+    names = args.scenario or list(scenarios)
+    settings = {"latency_ms": args.latency_ms, "latency": sorted(args.latency), "repeat": args.repeat}
+
+    baseline = None
+    same_settings = True
+    if os.path.exists(args.baseline) and not args.write_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        same_settings = baseline.get("settings") == settings
+        if args.gate_timings and not same_settings:
+            print(f"Baseline was recorded with {baseline.get('settings')}, not {settings}; "
+                  f"comparing upstream calls only")
+
+    process, base_url = start_fake_upstreams(args.fixtures, args.latency_ms, args.latency)
+    try:
+        route_to_fake_upstreams(base_url)
+        client = app.app.test_client()
+        results = {name: measure(client, base_url, name, scenarios[name], args.repeat) for name in names}
+    finally:
+        process.terminate()
+        process.wait()
+
+    print_results(results, baseline)
+    failures = [f"{name}: {error}" for name, result in results.items() for error in result["errors"]]
+    if baseline:
+        failures += compare(results, baseline, args.threshold, timings=args.gate_timings and same_settings)
+
+    if args.write_baseline and not failures:
+        with open(args.baseline, "w") as f:
+            json.dump({"settings": settings, "scenarios": {
+                name: {key: value for key, value in result.items() if key != "errors"}
+                for name, result in results.items()
+            }}, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {os.path.relpath(args.baseline, ROOT)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())